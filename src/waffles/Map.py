@@ -121,13 +121,7 @@ class Map:
             raise Exception(generate_exception_message( 1,
                                                         'Map.list_of_lists_is_well_formed()',
                                                         'The number of rows and columns must be positive.'))
-        if len(grid) != nrows:
-            return False
-        else:
-            for row in grid:
-                if len(row) != ncols:
-                    return False
-        return True
+        return len(grid) == nrows and all(len(row) == ncols for row in grid)
     
     @classmethod
     def from_unique_value(  cls,
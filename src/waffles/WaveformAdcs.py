@@ -124,6 +124,30 @@ class WaveformAdcs:
 
         return
 
+    def __set_adcs(self, input : np.ndarray) -> None:
+
+        """
+        This method is not intended for user usage. It is
+        a setter for the Adcs attribute. It is used by the
+        WaveformSet class to make the Adcs attribute of this
+        object a view of one row of the WaveformSet ADCs
+        matrix, so that the readout is not duplicated in
+        memory. No checks are performed here. It is the
+        caller's responsibility to ensure that the given
+        array has the same length as the current one.
+
+        Parameters
+        ----------
+        input : unidimensional numpy array of integers
+
+        Returns
+        ----------
+        None
+        """
+
+        self.__adcs = input
+        return
+
     def __truncate_adcs(self, number_of_points_to_keep : int) -> None:
 
         """
@@ -264,10 +288,17 @@ class WaveformAdcs:
                         int_ll,
                         int_ul)
             
-            analyser = getattr(aux, analyser_name)
-
-            output_1, output_2, output_3 = analyser(self,   *args, 
-                                                            **kwargs)
+            try:
+                analyser = WfAna.ANALYSERS[analyser_name]   # Unbound function, hence aux is given explicitly
+            except KeyError:
+                raise Exception(generate_exception_message( 2,
+                                                            'WaveformAdcs.analyse()',
+                                                            f"'{analyser_name}' does not match a WfAna method which is registered as an analyser (see the waveform_analyser decorator)."))
+            
+            output_1, output_2, output_3 = analyser(aux,
+                                                    self,
+                                                    *args, 
+                                                    **kwargs)
             aux.Result = output_1
             aux.Passed = output_2
 
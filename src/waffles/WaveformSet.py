@@ -1,6 +1,9 @@
 import math
 import inspect
+import weakref
 import array
+import functools
+import multiprocessing as mp
 
 import uproot
 import ROOT
@@ -18,6 +21,89 @@ from .Map import Map
 from .ChannelMap import ChannelMap
 from .Exceptions import generate_exception_message
 
+def _analyse_adcs_block( item : Tuple[int, np.ndarray, np.ndarray, np.ndarray],
+                        label : str,
+                        analyser_name : str,
+                        baseline_limits : List[int],
+                        args : tuple,
+                        int_ll : int,
+                        int_ul : int,
+                        kwargs : dict) -> Tuple[int, List[Tuple[WfAnaResult, bool, dict]]]:
+    
+    """
+    This function is not intended for user usage. It is 
+    the worker function which is run by the processes of
+    the pool which is spawned by WaveformSet.analyse() if
+    its 'n_processes' parameter is bigger than 1. It must
+    be defined at module level so that it can be pickled.
+    The given item holds a block of consecutive rows of 
+    the ADCs matrix of a WaveformSet, so that a single 
+    array is shipped to the worker per block, instead of
+    one Waveform object per waveform. For each row, it 
+    rebuilds a WaveformAdcs object, runs the 
+    WaveformAdcs.analyse() method on it, and collects 
+    the Result and Passed attributes of the resulting 
+    WfAna object, so that the parent process can attach
+    an equivalent WfAna object to the original waveform.
+    The WfAna object itself is not sent back, since 
+    pickling it takes several times longer.
+
+    Parameters
+    ----------
+    item : tuple
+        A tuple with four entries, which are, in order, the
+        iterator value of the first waveform of the block
+        within its WaveformSet, the bidimensional array with 
+        the Adcs of the waveforms in the block, and the
+        unidimensional arrays with their TimeStep_ns and 
+        TimeOffset, respectively
+    label : str
+    analyser_name : str
+    baseline_limits : list of int
+    args : tuple
+    int_ll : int
+    int_ul : int
+    kwargs : dict
+        These parameters are given to the homonymous 
+        parameters of WaveformAdcs.analyse(). args (resp.
+        kwargs) are unpacked as its positional (resp. 
+        keyword) arguments. For more information, check 
+        such method docstring.
+
+    Returns
+    ----------
+    start : int
+        The first entry of the given item
+    results : list of tuple of ( WfAnaResult, bool, dict, )
+        results[i] contains the Result and Passed attributes
+        of the WfAna object produced by WaveformAdcs.analyse()
+        for the i-th row of the block, and the output of 
+        such method
+    """
+
+    start, adcs_block, time_steps_ns, time_offsets = item
+
+    results = []
+
+    for adcs, time_step_ns, time_offset in zip(adcs_block, time_steps_ns.tolist(), time_offsets.tolist()):
+
+        aux = WaveformAdcs(time_step_ns,
+                           adcs,
+                           time_offset = time_offset)
+        
+        output = aux.analyse(   label,
+                                analyser_name,
+                                baseline_limits,
+                                *args,
+                                int_ll = int_ll,
+                                int_ul = int_ul,
+                                overwrite = True,
+                                **kwargs)
+        
+        results.append((aux.Analyses[label].Result, aux.Analyses[label].Passed, output))
+    
+    return start, results
+
 class WaveformSet:
 
     """
@@ -30,6 +116,26 @@ class WaveformSet:
     PointsPerWf : int
         Number of entries for the Adcs attribute of
         each Waveform object in this WaveformSet object.
+    AdcsMatrix : bidimensional numpy array
+        A contiguous array of shape
+        (len(Waveforms), PointsPerWf) so that AdcsMatrix[i]
+        gives the Adcs of the i-th waveform in the set.
+        The Adcs attribute of each Waveform object in this
+        WaveformSet is a view of its row in this matrix,
+        so the readout is not duplicated in memory, unless
+        such Waveform object was taken from another 
+        WaveformSet. In that case, its Adcs remain a view 
+        of the matrix of such other WaveformSet, and its 
+        row in this matrix is a copy of them. I.e. each
+        readout is backed by the matrix of only one 
+        WaveformSet. This matrix is meant to be used for 
+        vectorized computations over the whole set, p.e. 
+        AdcsMatrix.mean(axis = 0).
+        Its dtype is that of the given Adcs. The readers 
+        in WaveformSet.from_ROOT_file() store the readout 
+        as np.int16, unless it does not fit in such type,
+        so any computation which may overflow (p.e. sums)
+        must upcast it first.
     Runs : set of int
         It contains the run number of any run for which
         there is at least one waveform in the set.
@@ -86,6 +192,23 @@ class WaveformSet:
     ## Add the list of methods and a summary for each one here
     """
 
+    __resolved_analysers = {}   # Cache for WaveformSet.__resolve_analyser(). Its keys are
+                                # the names of the already-validated WfAna analysers.
+
+    __adcs_buffers = weakref.WeakValueDictionary()  # Maps id(buffer) to buffer, for every array whose memory backs the
+                                                    # ADCs matrix of a WaveformSet (see WaveformSet.__update_adcs_matrix())
+
+    __min_wfs_per_process = 256 # WaveformSet.analyse() falls back to the sequential analysis
+                                # if there are less waveforms than this number per process
+
+    __min_wfs_per_batch = 10000 # WaveformSet.analyse() only runs the batched counterpart of an analyser if there are,
+                                # at least, this many waveforms. Below it, loading its compiled kernel from the numba 
+                                # cache (~0.2 s per process, or several seconds if it must be compiled) does not pay off.
+
+    __min_rows_per_kernel = 10000   # WaveformSet.__get_mean_of_rows() only sums the selected rows in place via 
+                                    # WaveformSet.__add_rows_in_parallel() if there are, at least, this many of them.
+                                    # Below it, gathering them with fancy indexing is cheaper than loading such kernel.
+
     def __init__(self,  *waveforms):
         
         """
@@ -104,27 +227,97 @@ class WaveformSet:
                                                         'WaveformSet.__init__()',
                                                         'There must be at least one waveform in the set.'))
         self.__waveforms = list(waveforms)
-
-        if not self.check_length_homogeneity():
-            raise Exception(generate_exception_message( 2,
-                                                        'WaveformSet.__init__()',
-                                                        'The length of the given waveforms is not homogeneous.'))
         
         self.__points_per_wf = len(self.__waveforms[0].Adcs)
 
+        adcs, endpoints, channels, runs, record_numbers, timestamps = [], [], [], [], [], []
+
+        for wf in self.__waveforms:     # The only Python-level pass over the given waveforms. The 
+                                        # ADCs matrix and the columns are built out of these lists.
+            wf_adcs = wf.Adcs
+
+            if len(wf_adcs) != self.__points_per_wf:
+                raise Exception(generate_exception_message( 2,
+                                                            'WaveformSet.__init__()',
+                                                            'The length of the given waveforms is not homogeneous.'))
+            adcs.append(wf_adcs)
+            endpoints.append(wf.Endpoint)
+            channels.append(wf.Channel)
+            runs.append(wf.RunNumber)
+            record_numbers.append(wf.RecordNumber)
+            timestamps.append(wf.Timestamp)
+
+        self.__set_up(  adcs,
+                        np.array(endpoints, dtype = np.int32),
+                        np.array(channels, dtype = np.int32),
+                        np.array(runs, dtype = np.int32),
+                        np.array(record_numbers, dtype = np.int64),
+                        np.array(timestamps, dtype = np.int64))
+        
+    def __set_up(self,  adcs : Union[np.ndarray, List[np.ndarray]],
+                        endpoints : np.ndarray,
+                        channels : np.ndarray,
+                        runs_per_wf : np.ndarray,
+                        record_numbers_per_wf : np.ndarray,
+                        timestamps : np.ndarray) -> None:
+        
+        """
+        This method is not intended for user usage. It 
+        must only be called by WaveformSet.__init__() and
+        WaveformSet.from_arrays(), once the self.__waveforms
+        and self.__points_per_wf attributes have been 
+        defined. It defines the rest of the attributes of 
+        this WaveformSet out of the given per-waveform 
+        columns, without iterating the Waveform objects 
+        again.
+
+        Parameters
+        ----------
+        adcs : bidimensional numpy array, or list of unidimensional numpy arrays
+            It is given to the 'adcs' parameter of 
+            WaveformSet.__update_adcs_matrix()
+        endpoints : unidimensional numpy array of int32
+        channels : unidimensional numpy array of int32
+        runs_per_wf : unidimensional numpy array of int32
+        record_numbers_per_wf : unidimensional numpy array of int64
+        timestamps : unidimensional numpy array of int64
+            They are given to the homonymous parameters of 
+            WaveformSet.__set_columns()
+
+        Returns
+        ----------
+        None
+        """
+
+        self.__adcs_matrix = None
+        self.__adcs_buffer = None               # The array which owns the memory of self.__adcs_matrix
+        self.__update_adcs_matrix(adcs = adcs)
+
+        self.__endpoints = None
+        self.__channels = None
+        self.__runs_per_wf = None
+        self.__record_numbers_per_wf = None
+        self.__timestamps = None
+        self.__idcs_by_endpoint_and_channel = None
+        self.__set_columns( endpoints,
+                            channels,
+                            runs_per_wf,
+                            record_numbers_per_wf,
+                            timestamps)
+        
         self.__runs = set()
-        self.__update_runs(other_runs = None)
+        self.__update_runs(other_runs = None)   # Relies on self.__runs_per_wf
 
         self.__record_numbers = {}
-        self.__update_record_numbers(other_record_numbers = None)
+        self.__update_record_numbers(other_record_numbers = None)   # Relies on self.__runs_per_wf
+                                                                    # and self.__record_numbers_per_wf
+
+        self.__available_channels = None        # Lazily computed by the AvailableChannels getter
 
-        self.__available_channels = {}
-        self.__update_available_channels(other_available_channels = None)   # Running on an Apple M2, it took 
-                                                                            # ~ 52 ms to run this line for a
-                                                                            # WaveformSet with 1046223 waveforms
         self.__mean_adcs = None
         self.__mean_adcs_idcs = None
-
+        return
+    
     #Getters
     @property
     def Waveforms(self):
@@ -133,7 +326,11 @@ class WaveformSet:
     @property
     def PointsPerWf(self):
         return self.__points_per_wf
-    
+
+    @property
+    def AdcsMatrix(self):
+        return self.__adcs_matrix
+
     @property
     def Runs(self):
         return self.__runs
@@ -144,6 +341,8 @@ class WaveformSet:
     
     @property
     def AvailableChannels(self):
+        if self.__available_channels is None:   # Computed on first access, since many
+            self.__reset_available_channels()   # workflows never need it
         return self.__available_channels
     
     @property
@@ -154,6 +353,150 @@ class WaveformSet:
     def MeanAdcsIdcs(self):
         return self.__mean_adcs_idcs
     
+    def __set_columns(self, endpoints : np.ndarray,
+                            channels : np.ndarray,
+                            runs_per_wf : np.ndarray,
+                            record_numbers_per_wf : np.ndarray,
+                            timestamps : np.ndarray) -> None:
+
+        """
+        This method is not intended for user usage. It
+        sets the self.__endpoints, self.__channels,
+        self.__runs_per_wf, self.__record_numbers_per_wf 
+        and self.__timestamps attributes, which are 
+        unidimensional numpy arrays of length 
+        len(self.__waveforms), so that their i-th entry
+        gives the Endpoint, Channel, RunNumber, RecordNumber
+        and Timestamp of the i-th waveform in this 
+        WaveformSet, respectively. These columns allow 
+        selecting waveforms by means of vectorized boolean
+        masks (see WaveformSet.get_idcs()). As it happens 
+        with WaveformSet.__update_adcs_matrix(), this method
+        must be called whenever waveforms are added to or
+        removed from this WaveformSet. The given columns
+        are derived from the existing ones, or gathered 
+        in the single pass of WaveformSet.__init__(), so 
+        that the Waveform objects are not iterated again.
+
+        Parameters
+        ----------
+        endpoints : unidimensional numpy array of int32
+        channels : unidimensional numpy array of int32
+        runs_per_wf : unidimensional numpy array of int32
+        record_numbers_per_wf : unidimensional numpy array of int64
+        timestamps : unidimensional numpy array of int64
+
+        Returns
+        ----------
+        None
+        """
+
+        self.__endpoints = endpoints
+        self.__channels = channels
+        self.__runs_per_wf = runs_per_wf
+        self.__record_numbers_per_wf = record_numbers_per_wf
+        self.__timestamps = timestamps
+        
+        self.__idcs_by_endpoint_and_channel = None  # Derived from the columns, so it must be recomputed
+                                                    # (see WaveformSet.__get_idcs_by_endpoint_and_channel())
+        return
+    
+    def __get_idcs_by_endpoint_and_channel(self) -> Dict[Tuple[int, int], np.ndarray]:
+
+        """
+        This method is not intended for user usage. It 
+        returns a dictionary whose keys are the 
+        (endpoint, channel) pairs for which there is at 
+        least one waveform in this WaveformSet. The value
+        for each key is an increasingly-ordered numpy 
+        array with the iterator values of the waveforms 
+        which come from such endpoint and channel. Such 
+        dictionary is computed on the first call after 
+        the last change in the waveforms of this 
+        WaveformSet, and it is cached afterwards.
+
+        Returns
+        ----------
+        output : dictionary of unidimensional numpy arrays
+        """
+
+        if self.__idcs_by_endpoint_and_channel is None:
+
+            order = np.lexsort((self.__channels, self.__endpoints))    # Stable, so the iterator values of 
+                                                                        # each group remain increasingly ordered
+            endpoints = self.__endpoints[order]
+            channels = self.__channels[order]
+
+            boundaries = np.flatnonzero((np.diff(endpoints) != 0) | (np.diff(channels) != 0)) + 1
+
+            self.__idcs_by_endpoint_and_channel = { (int(endpoints[group[0]]), int(channels[group[0]])) : order[group[0] : group[-1] + 1]
+                                                    for group in np.split(np.arange(len(order)), boundaries) }
+        
+        return self.__idcs_by_endpoint_and_channel
+    
+    def get_idcs(self,  endpoint : Optional[int] = None,
+                        channel : Optional[int] = None,
+                        run : Optional[int] = None) -> np.ndarray:
+        
+        """
+        This method returns the iterator values, with 
+        respect to this WaveformSet, of the waveforms
+        which come from the given endpoint and channel
+        and which were acquired during the given run.
+        Any of these parameters which is None is not
+        used for the selection. The selection is 
+        performed via boolean masks over precomputed
+        numpy columns, so no Python-level loop over
+        the waveforms is run. If both, endpoint and
+        channel, are defined, then the candidates are
+        taken from the cached (endpoint, channel) index
+        (see WaveformSet.__get_idcs_by_endpoint_and_channel())
+        so that the run mask, if any, is only evaluated
+        over the waveforms of such channel.
+
+        Parameters
+        ----------
+        endpoint : int
+            If it is defined, only the waveforms whose
+            Endpoint attribute matches it are selected.
+        channel : int
+            If it is defined, only the waveforms whose
+            Channel attribute matches it are selected.
+        run : int
+            If it is defined, only the waveforms whose
+            RunNumber attribute matches it are selected.
+
+        Returns
+        ----------
+        output : unidimensional numpy array of int
+            The increasingly-ordered iterator values of 
+            the selected waveforms. If every parameter is
+            None, then it contains every iterator value
+            in [0, len(self.Waveforms) - 1].
+        """
+
+        if endpoint is not None and channel is not None:
+
+            idcs = self.__get_idcs_by_endpoint_and_channel().get(  (endpoint, channel),
+                                                                    np.empty((0,), dtype = np.intp))
+            if run is not None:
+                return idcs[self.__runs_per_wf[idcs] == run]
+            
+            return idcs.copy()  # The cached array must not be exposed
+
+        mask = np.ones((len(self.__waveforms),), dtype = bool)
+
+        if endpoint is not None:
+            mask &= self.__endpoints == endpoint
+
+        if channel is not None:
+            mask &= self.__channels == channel
+
+        if run is not None:
+            mask &= self.__runs_per_wf == run
+
+        return np.flatnonzero(mask)
+    
     def get_set_of_endpoints(self) -> set:
             
         """
@@ -168,8 +511,8 @@ class WaveformSet:
 
         output = set()
 
-        for run in self.__available_channels.keys():
-            for endpoint in self.__available_channels[run].keys():
+        for run in self.AvailableChannels.keys():
+            for endpoint in self.AvailableChannels[run].keys():
                 output.add(endpoint)
 
         return output
@@ -193,14 +536,14 @@ class WaveformSet:
         output = {}
 
         for run in self.__runs:
-            for endpoint in self.__available_channels[run].keys():
+            for endpoint in self.AvailableChannels[run].keys():
                 try:
                     aux = output[endpoint]
                 except KeyError:
                     output[endpoint] = set()
                     aux = output[endpoint]
 
-                for channel in self.__available_channels[run][endpoint]:
+                for channel in self.AvailableChannels[run][endpoint]:
                     aux.add(channel)
 
         return output
@@ -223,12 +566,225 @@ class WaveformSet:
                 raise Exception(generate_exception_message( 1,
                                                             'WaveformSet.check_length_homogeneity()',
                                                             'There must be at least one waveform in the set.'))
-            length = len(self.__waveforms[0].Adcs)
-            for i in range(1, len(self.__waveforms)):
-                if len(self.__waveforms[i].Adcs) != length:
-                    return False
-            return True
+            lengths = np.fromiter(  (len(wf.Adcs) for wf in self.__waveforms),
+                                    dtype = np.int64,
+                                    count = len(self.__waveforms))
+            
+            return bool((lengths == lengths[0]).all())
+
+    def __update_adcs_matrix(self, adcs : Optional[Union[np.ndarray, List[np.ndarray]]] = None) -> None:
+
+        """
+        This method is not intended for user usage.
+        It stacks the Adcs attribute of every waveform
+        in this WaveformSet into the self.__adcs_matrix
+        bidimensional array, whose i-th row matches the
+        Adcs of the i-th waveform. Then, the Adcs attribute
+        of each waveform is replaced by a view of its row
+        in such matrix, so that there is only one copy of
+        the readout in memory. The waveforms whose Adcs are
+        already backed by the matrix of another WaveformSet
+        are the exception: their Adcs are left untouched,
+        and their rows in self.__adcs_matrix are copies, 
+        so that the matrix of such other WaveformSet keeps
+        matching its waveforms. This method must be called
+        whenever waveforms are added to or removed from
+        this WaveformSet. The length homogeneity of the
+        waveforms must have been checked beforehand.
+
+        Parameters
+        ----------
+        adcs : bidimensional numpy array, or list of unidimensional numpy arrays
+            If it is defined, adcs[i] must be the Adcs 
+            attribute of the i-th waveform in this 
+            WaveformSet. If it is None, such list is 
+            gathered from self.__waveforms. If it is a
+            C-contiguous bidimensional array, then it is 
+            adopted as the ADCs matrix, unless another
+            WaveformSet owns it.
+
+        Returns
+        ----------
+        None
+        """
+
+        if adcs is None:
+            adcs = [wf.Adcs for wf in self.__waveforms]
+
+        if isinstance(adcs, np.ndarray):    # P.e. the matrix given to WaveformSet.from_arrays()
+            matrix = adcs if adcs.flags.c_contiguous else None
+        else:
+            matrix = WaveformSet.__get_backing_matrix(adcs)
+
+        if matrix is not None and not self.__is_backed_by_another_set(matrix):  # The waveforms are already the consecutive rows 
+                                                                                # of a single matrix, p.e. the one built by a 
+            self.__set_adcs_matrix(matrix)                                      # reader, which no other WaveformSet owns. 
+            return                                                              # Adopt it as is.
+
+        dtype = adcs.dtype if isinstance(adcs, np.ndarray) else \
+            functools.reduce(np.promote_types, {wf_adcs.dtype for wf_adcs in adcs})    # The one np.stack() would pick
+
+        matrix = WaveformSet.__get_aligned_empty(   (len(adcs), len(adcs[0])),
+                                                    dtype)
+        matrix[:] = adcs    # Roughly twice as fast as np.stack(adcs, out = matrix)
+
+        owners = { id(wf_adcs.base) : wf_adcs.base for wf_adcs in adcs if wf_adcs.base is not None }
+
+        foreign_owners = { owner_id for owner_id, owner in owners.items()   # Checked once per owner, and before 
+                            if self.__is_backed_by_another_set(owner) }     # self.__adcs_buffer is replaced, so that 
+                                                                            # the waveforms backed by the old one are rebound
+        self.__set_adcs_matrix(matrix)
+
+        for wf, wf_adcs, row in zip(self.__waveforms, adcs, matrix):
+            if not foreign_owners or id(wf_adcs.base) not in foreign_owners:
+                wf._WaveformAdcs__set_adcs(row)
+        return
+    
+    def __set_adcs_matrix(self, matrix : np.ndarray) -> None:
+
+        """
+        This method is not intended for user usage. It 
+        must only be called by WaveformSet.__update_adcs_matrix().
+        It sets the given matrix as the self.__adcs_matrix
+        attribute, and it registers the array which owns 
+        its memory as owned by this WaveformSet (see
+        WaveformSet.__is_backed_by_another_set()).
+
+        Parameters
+        ----------
+        matrix : bidimensional numpy array
+
+        Returns
+        ----------
+        None
+        """
+
+        self.__adcs_matrix = matrix
+        self.__adcs_buffer = matrix if matrix.base is None else matrix.base
+
+        WaveformSet.__adcs_buffers[id(self.__adcs_buffer)] = self.__adcs_buffer
+        return
     
+    def __is_backed_by_another_set(self, array : np.ndarray) -> bool:
+
+        """
+        This method is not intended for user usage. It 
+        returns True if the memory of the given array is 
+        owned by an array which backs, or backed, the ADCs
+        matrix of a WaveformSet other than this one. It 
+        returns False if else, p.e. if the given array owns
+        its memory, or if it is a view of an array built by
+        a reader.
+
+        Parameters
+        ----------
+        array : numpy array
+
+        Returns
+        ----------
+        bool
+        """
+
+        owner = array if array.base is None else array.base     # numpy collapses chains of views
+
+        return owner is not self.__adcs_buffer and WaveformSet.__is_backed_by_a_set(owner)
+    
+    @staticmethod
+    def __is_backed_by_a_set(array : np.ndarray) -> bool:
+
+        """
+        This method is not intended for user usage. It 
+        returns True if the memory of the given array is 
+        owned by an array which backs, or backed, the ADCs
+        matrix of any WaveformSet. It returns False if else.
+
+        Parameters
+        ----------
+        array : numpy array
+
+        Returns
+        ----------
+        bool
+        """
+
+        owner = array if array.base is None else array.base
+
+        return WaveformSet.__adcs_buffers.get(id(owner)) is owner
+    
+    @staticmethod
+    def __get_backing_matrix(adcs : List[np.ndarray]) -> Optional[np.ndarray]:
+
+        """
+        This method is not intended for user usage. It 
+        must only be called by WaveformSet.__update_adcs_matrix().
+        It checks whether the given Adcs arrays are, in 
+        order, consecutive rows of one 
+        and the same C-contiguous memory buffer, p.e. the
+        matrix built by a reader. If so, it returns a 
+        bidimensional array which views such rows, so that
+        it can be adopted as the ADCs matrix of a WaveformSet 
+        without copying the readout. It returns None if else.
+
+        Parameters
+        ----------
+        adcs : list of unidimensional numpy arrays
+
+        Returns
+        ----------
+        output : bidimensional numpy array or None
+        """
+        first = adcs[0]
+        owner = first.base      # numpy collapses chains of views, so this is the array which owns the buffer
+
+        if not isinstance(owner, np.ndarray) or not owner.flags.c_contiguous or not first.flags.c_contiguous:
+            return None
+        
+        address = first.__array_interface__['data'][0]
+        stride = first.nbytes   # Consecutive rows, so that the returned array is C-contiguous
+
+        for i, wf_adcs in enumerate(adcs):
+            if wf_adcs.base is not owner or wf_adcs.dtype != first.dtype or len(wf_adcs) != len(first) \
+                or not wf_adcs.flags.c_contiguous or wf_adcs.__array_interface__['data'][0] != address + (i * stride):
+                return None
+            
+        return np.ndarray(  (len(adcs), len(first)),
+                            dtype = first.dtype,
+                            buffer = owner,
+                            offset = address - owner.__array_interface__['data'][0])
+    
+    @staticmethod
+    def __get_aligned_empty(shape : Tuple[int, ...],
+                            dtype : np.dtype,
+                            alignment : int = 64) -> np.ndarray:
+        
+        """
+        This method is not intended for user usage. It 
+        returns an uninitialized C-contiguous array of the
+        given shape and data type, whose first element is
+        aligned to the given number of bytes. By default,
+        it is aligned to a 64-byte boundary, i.e. a cache 
+        line, so that numpy's SIMD reductions over it may
+        use aligned loads. numpy itself only guarantees 
+        16-byte alignment.
+
+        Parameters
+        ----------
+        shape : tuple of int
+        dtype : numpy.dtype
+        alignment : int
+            It must be a positive integer
+
+        Returns
+        ----------
+        output : numpy array
+        """
+
+        nbytes = math.prod(shape) * np.dtype(dtype).itemsize
+        buffer = np.empty((nbytes + alignment,), dtype = np.uint8)
+        offset = (-buffer.__array_interface__['data'][0]) % alignment
+
+        return buffer[offset : offset + nbytes].view(dtype).reshape(shape)
+
     def __update_runs(self, other_runs : Optional[set] = None) -> None:
         
         """
@@ -273,16 +829,15 @@ class WaveformSet:
         This method must only be called by the
         WaveformSet.__update_runs() method. It clears
         the self.__runs attribute of this object and 
-        then iterates through the whole WaveformSet to 
-        fill such attribute according to the waveforms 
-        which are currently present in this WaveformSet 
-        object.
+        then fills such attribute according to the 
+        waveforms which are currently present in this 
+        WaveformSet object. To do so, it relies on the
+        self.__runs_per_wf column, so it must be called
+        after WaveformSet.__set_columns().
         """
 
         self.__runs.clear()
-
-        for wf in self.__waveforms:
-            self.__runs.add(wf.RunNumber)
+        self.__runs.update(np.unique(self.__runs_per_wf).tolist())
 
         return
     
@@ -342,19 +897,16 @@ class WaveformSet:
         This method must only be called by the
         WaveformSet.__update_record_numbers() method. It clears
         the self.__record_numbers attribute of this object and 
-        then iterates through the whole WaveformSet to fill such 
-        attribute according to the waveforms which are currently 
-        present in this WaveformSet object.
+        then fills it according to the waveforms which are currently 
+        present in this WaveformSet object. To do so, it relies on
+        the self.__runs_per_wf and self.__record_numbers_per_wf 
+        columns, so it must be called after WaveformSet.__set_columns().
         """
 
         self.__record_numbers.clear()
 
-        for wf in self.__waveforms:
-            try:
-                self.__record_numbers[wf.RunNumber].add(wf.RecordNumber)
-            except KeyError:
-                self.__record_numbers[wf.RunNumber] = set()
-                self.__record_numbers[wf.RunNumber].add(wf.RecordNumber)
+        for run in np.unique(self.__runs_per_wf).tolist():
+            self.__record_numbers[run] = set(self.__record_numbers_per_wf[self.__runs_per_wf == run].tolist())
         return
 
     def __update_available_channels(self, other_available_channels : Optional[Dict[int, Dict[int, set]]] = None) -> None:
@@ -370,11 +922,15 @@ class WaveformSet:
         Parameters
         ----------
         other_available_channels : dictionary of dictionaries of sets
-            If it is None, then this method clears the
+            If it is None, then this method sets the
             self.__available_channels attribute of this object
-            and then iterates through the whole WaveformSet
-            to fill such attribute according to the waveforms
-            which are currently present in this WaveformSet.
+            to None, so that it is recomputed, according to the
+            waveforms which are currently present in this 
+            WaveformSet, the next time that it is accessed
+            via the AvailableChannels getter. If the 
+            self.__available_channels attribute has not been
+            computed yet, then this method does nothing,
+            regardless the given other_available_channels.
             If the 'other_available_channels' parameter is 
             defined, then it must be a dictionary of dictionaries
             of sets of integers, as expected for the 
@@ -392,9 +948,9 @@ class WaveformSet:
         """
 
         if other_available_channels is None:
-            self.__reset_available_channels()
+            self.__available_channels = None
 
-        else:
+        elif self.__available_channels is not None:
             for run in other_available_channels.keys():
                 if run in self.__available_channels.keys():     # If this run is present in both, this WaveformSet and
                                                                 # the incoming one, then carefully merge the information
@@ -421,31 +977,37 @@ class WaveformSet:
 
         """
         This method is not intended for user usage.
-        This method must only be called by the
-        WaveformSet.__update_available_channels() method. It clears
-        the self.__available_channels attribute of this object and 
-        then iterates through the whole WaveformSet to fill such 
-        attribute according to the waveforms which are currently 
-        present in this WaveformSet object.
+        This method must only be called by the AvailableChannels
+        getter. It fills the self.__available_channels attribute 
+        of this object from scratch, according to the waveforms 
+        which are currently present in this WaveformSet object.
+        To do so, it relies on the self.__runs_per_wf, 
+        self.__endpoints and self.__channels columns.
         """
 
-        self.__available_channels.clear()
+        self.__available_channels = {}
 
-        for wf in self.__waveforms:
-            try:
-                aux = self.__available_channels[wf.RunNumber]
+        runs, endpoints, channels = (column.astype(np.int64) for column in (self.__runs_per_wf, self.__endpoints, self.__channels))
+        minima = [int(column.min()) for column in (runs, endpoints, channels)]
+        spans = [int(column.max()) - minimum + 1 for column, minimum in zip((runs, endpoints, channels), minima)]
 
-                try:
-                    aux[wf.Endpoint].add(wf.Channel)
+        if math.prod(spans) <= np.iinfo(np.int64).max:  # Pack each (run, endpoint, channel) triplet into a single int64 
+                                                        # key, since np.unique() over a 1D array is much faster than
+                                                        # np.unique(..., axis = 0), which sorts a structured view
+            keys = np.unique(   (((runs - minima[0]) * spans[1]) + (endpoints - minima[1])) * spans[2] \
+                                + (channels - minima[2]))
+            
+            keys, channels = np.divmod(keys, spans[2])
+            runs, endpoints = np.divmod(keys, spans[1])
 
-                except KeyError:
-                    aux[wf.Endpoint] = set()
-                    aux[wf.Endpoint].add(wf.Channel)
+            triplets = zip( (runs + minima[0]).tolist(),        # Only the unique (run, endpoint, channel) 
+                            (endpoints + minima[1]).tolist(),   # triplets are iterated in Python
+                            (channels + minima[2]).tolist())
+        else:
+            triplets = set(zip(runs.tolist(), endpoints.tolist(), channels.tolist()))
 
-            except KeyError:
-                self.__available_channels[wf.RunNumber] = {}
-                self.__available_channels[wf.RunNumber][wf.Endpoint] = set()
-                self.__available_channels[wf.RunNumber][wf.Endpoint].add(wf.Channel)
+        for run, endpoint, channel in triplets:
+            self.__available_channels.setdefault(run, {}).setdefault(endpoint, set()).add(channel)
         return
     
     def analyse(self,   label : str,
@@ -455,6 +1017,7 @@ class WaveformSet:
                         int_ll : int = 0,
                         int_ul : Optional[int] = None,
                         overwrite : bool = False,
+                        n_processes : Optional[int] = 1,
                         **kwargs) -> dict:
         
         """
@@ -471,8 +1034,15 @@ class WaveformSet:
         are integers in [0, len(self.__waveforms) - 1]. 
         ouptut[i] matches the output of 
         self.__waveforms[i].analyse(...), which is a dictionary. 
-        I.e. the output of this method is a dictionary of 
-        dictionaries.
+        I.e. the output of this method is a dictionary of
+        dictionaries. If the WfAna class implements a batched
+        counterpart of the given analyser, i.e. a method whose
+        name is analyser_name + '_batch' (p.e.
+        WfAna.standard_analyser_batch()), and this WaveformSet
+        is big enough for it to pay off, then such method is
+        run once over the whole self.AdcsMatrix, and its
+        results are distributed among the waveforms, instead
+        of calling Waveform.analyse() for each waveform.
 
         Parameters
         ----------
@@ -481,7 +1051,8 @@ class WaveformSet:
             for the new WfAna object within its Analyses
             attribute.
         analyser_name : str
-            It must match the name of a WfAna method whose first            
+            It must match the name of a WfAna method which is       
+            decorated with waveform_analyser, and whose first       
             argument must be called 'waveform' and whose type       # The only way to import the WaveformAdcs class in WfAna without having     # This would not be a problem (and we would not    
             annotation must match the WaveformAdcs class or the     # a circular import is to use the typing.TYPE_CHECKING variable, which      # need to grab the analyser method using an 
             'WaveformAdcs' string literal. Such method should       # is only defined for type-checking runs. As a consequence, the type        # string and getattr) if the analyser methods were
@@ -525,6 +1096,36 @@ class WaveformSet:
             'analyse' method will overwrite any existing
             WfAna object with the same label (key) within
             its Analyses attribute.
+        n_processes : int
+            This parameter only makes a difference if the
+            batched counterpart of the given analyser, if
+            any, is not run (see above). If
+            it is bigger than 1, then the waveforms are 
+            analysed in parallel by a pool of n_processes 
+            worker processes, which bypasses the GIL. If it
+            is None, then the number of processes is set to
+            multiprocessing.cpu_count(). Blocks of rows of 
+            self.AdcsMatrix, along with the TimeStep_ns and
+            TimeOffset of such waveforms, are shipped to the
+            workers, and the WfAna objects are rebuilt out 
+            of the results in the parent process. If there 
+            are too few waveforms per process for the 
+            parallelization to pay off, the waveforms are 
+            analysed sequentially anyway. Note that the 
+            results of each waveform must still be pickled
+            back to the parent process, which takes tens of
+            microseconds per waveform. Hence, this option 
+            only pays off for analysers which are expensive
+            per waveform. For cheap ones, such as
+            WfAna.standard_analyser(), the sequential 
+            analysis is usually faster. The workers are 
+            started via the 'forkserver' start method of
+            multiprocessing, so, as for the 'spawn' one, 
+            the code of a script which calls this method 
+            with n_processes bigger than 1 must be guarded 
+            by an if __name__ == '__main__': block. The 
+            first of such calls also starts the server 
+            process, which takes a second or two.
         **kwargs
             For each analysed waveform, these are the
             keyword arguments which are given to the
@@ -554,42 +1155,85 @@ class WaveformSet:
             raise Exception(generate_exception_message( 2,
                                                         'WaveformSet.analyse()',
                                                         f"The integration window ({int_ll}, {int_ul_}) is not well formed."))
-        aux = WfAna([0,1],  # Dummy object to access
-                    0,      # the analyser instance method
-                    1,)
-        try:
-            analyser = getattr(aux, analyser_name)
-        except AttributeError:
-            raise Exception(generate_exception_message( 3,
-                                                        'WaveformSet.analyse()',
-                                                        f"The analyser method '{analyser_name}' does not exist in the WfAna class."))
-        try:
-            signature = inspect.signature(analyser)
-        except TypeError:
-            raise Exception(generate_exception_message( 4,
-                                                        'WaveformSet.analyse()',
-                                                        f"'{analyser_name}' does not match a callable attribute of WfAna."))
-        try:
-            if list(signature.parameters.keys())[0] != 'waveform':
-                raise Exception(generate_exception_message( 5,
-                                                            "WaveformSet.analyse()",
-                                                            "The name of the first parameter of the given analyser method must be 'waveform'."))
-            
-            if signature.parameters['waveform'].annotation not in ['WaveformAdcs', WaveformAdcs]:
-                raise Exception(generate_exception_message( 6,
-                                                            "WaveformSet.analyse()",
-                                                            "The 'waveform' parameter of the analyser method must be hinted as a WaveformAdcs object."))
-            
-            if signature.return_annotation != Tuple[WfAnaResult, bool, dict]:
-                raise Exception(generate_exception_message( 7,
-                                                            "WaveformSet.analyse()",
-                                                            "The return type of the analyser method must be hinted as Tuple[WfAnaResult, bool, dict]."))
-        except IndexError:
-            raise Exception(generate_exception_message( 8,
-                                                        "WaveformSet.analyse()",
-                                                        'The given analyser method must take at least one parameter.'))
+        _, batch_analyser = WaveformSet.__resolve_analyser(analyser_name)
+
         output = {}
 
+        if batch_analyser is not None and len(self.__waveforms) >= WaveformSet.__min_wfs_per_batch:  
+                                        # The analyser has a batched counterpart, which
+                                        # analyses the whole self.__adcs_matrix at once
+
+            for wf in self.__waveforms:
+                if label in wf.Analyses.keys() and not overwrite:
+                    raise Exception(generate_exception_message( 9,
+                                                                'WaveformSet.analyse()',
+                                                                f"There is already an analysis with label '{label}'. If you want to overwrite it, set the 'overwrite' parameter to True."))
+            batch_output = batch_analyser(  WfAna(  baseline_limits,
+                                                    int_ll,
+                                                    int_ul_),
+                                            self.__adcs_matrix,
+                                            np.fromiter((wf.TimeOffset for wf in self.__waveforms), dtype = np.int64, count = len(self.__waveforms)),
+                                            np.fromiter((wf.TimeStep_ns for wf in self.__waveforms), dtype = np.float64, count = len(self.__waveforms)),
+                                            *args,
+                                            **kwargs)
+
+            for i in range(len(self.__waveforms)):
+
+                wf_ana = WfAna( baseline_limits,
+                                int_ll,
+                                int_ul_)
+
+                wf_ana.Result, wf_ana.Passed, output[i] = batch_output[i]
+
+                self.__waveforms[i].Analyses[label] = wf_ana
+
+            return output
+
+        if n_processes is None:
+            n_processes = mp.cpu_count()
+
+        if n_processes > 1 and len(self.__waveforms) >= n_processes * WaveformSet.__min_wfs_per_process:
+
+            for wf in self.__waveforms:
+                if label in wf.Analyses.keys() and not overwrite:
+                    raise Exception(generate_exception_message( 10,
+                                                                'WaveformSet.analyse()',
+                                                                f"There is already an analysis with label '{label}'. If you want to overwrite it, set the 'overwrite' parameter to True."))
+            worker = functools.partial( _analyse_adcs_block,
+                                        label = label,
+                                        analyser_name = analyser_name,
+                                        baseline_limits = baseline_limits,
+                                        args = args,
+                                        int_ll = int_ll,
+                                        int_ul = int_ul_,
+                                        kwargs = kwargs)
+            
+            time_steps_ns = np.fromiter((wf.TimeStep_ns for wf in self.__waveforms), dtype = np.float64, count = len(self.__waveforms))
+            time_offsets = np.fromiter((wf.TimeOffset for wf in self.__waveforms), dtype = np.int64, count = len(self.__waveforms))
+
+            block_size = max(1, len(self.__waveforms) // (4 * n_processes))     # A few blocks per process, for load balancing
+
+            items = (   (start, self.__adcs_matrix[start : start + block_size], time_steps_ns[start : start + block_size], time_offsets[start : start + block_size])
+                        for start in range(0, len(self.__waveforms), block_size))
+
+            context = mp.get_context('forkserver')     # Forking this process could leave it hung at exit if numba 
+                                                        # has already started its parallel (p.e. TBB) worker threads,
+            context.set_forkserver_preload([__name__])  # so the workers are forked from a clean server process
+                                                        # instead, which imports this module only once
+            with context.Pool(n_processes) as pool:
+                for start, results in pool.imap_unordered(worker, items):
+                    for i, result in enumerate(results, start = start):
+
+                        wf_ana = WfAna( baseline_limits,
+                                        int_ll,
+                                        int_ul_)
+                        
+                        wf_ana.Result, wf_ana.Passed, output[i] = result
+
+                        self.__waveforms[i].Analyses[label] = wf_ana
+
+            return output
+
         for i in range(len(self.__waveforms)):
             output[i] = self.__waveforms[i].analyse(    label,
                                                         analyser_name,
@@ -601,6 +1245,56 @@ class WaveformSet:
                                                         **kwargs)
         return output
     
+    @staticmethod
+    def __resolve_analyser(analyser_name : str) -> Tuple[Callable, Optional[Callable]]:
+
+        """
+        This method is not intended for user usage. It 
+        must only be called by the WaveformSet.analyse()
+        method. It checks that the given analyser_name 
+        matches a WfAna method which has been registered 
+        as an analyser via the waveform_analyser decorator.
+        If it is not, an exception is raised. Since the 
+        result of such check only depends on analyser_name,
+        it is performed only once per name, and its result 
+        is cached in the WaveformSet.__resolved_analysers 
+        dictionary.
+
+        Parameters
+        ----------
+        analyser_name : str
+
+        Returns
+        ----------
+        analyser : callable
+            The WfAna function whose name matches analyser_name
+        batch_analyser : callable
+            The WfAna function whose name matches 
+            analyser_name + '_batch', if it exists, or None
+            if else
+        """
+
+        if analyser_name in WaveformSet.__resolved_analysers.keys():
+            return WaveformSet.__resolved_analysers[analyser_name]
+
+        if not hasattr(WfAna, analyser_name):
+            raise Exception(generate_exception_message( 1,
+                                                        'WaveformSet.__resolve_analyser()',
+                                                        f"The analyser method '{analyser_name}' does not exist in the WfAna class."))
+        
+        if analyser_name not in WfAna.ANALYSERS:    # A single dictionary lookup, instead of inspecting the signature
+                                                    # of the analyser. The signatures of the registered analysers are 
+                                                    # checked by WfAna.check_analysers() when WfAna is imported.
+            raise Exception(generate_exception_message( 2,
+                                                        'WaveformSet.__resolve_analyser()',
+                                                        f"'{analyser_name}' does not match a WfAna method which is registered as an analyser (see the waveform_analyser decorator)."))
+        
+        output = ( WfAna.ANALYSERS[analyser_name], getattr(WfAna, analyser_name + '_batch', None), )
+
+        WaveformSet.__resolved_analysers[analyser_name] = output
+
+        return output
+    
     def baseline_limits_are_well_formed(self, baseline_limits : List[int]) -> bool:
 
         """
@@ -617,20 +1311,12 @@ class WaveformSet:
         bool
         """
 
-        if len(baseline_limits)%2 != 0:
-            return False
+        limits = np.asarray(baseline_limits)
 
-        if baseline_limits[0] < 0:
-            return False
-            
-        for i in range(0, len(baseline_limits) - 1):
-            if baseline_limits[i] >= baseline_limits[i + 1]:
-                return False
-                
-        if baseline_limits[-1] > self.PointsPerWf - 1:
+        if limits.size == 0 or limits.size%2 != 0:
             return False
-        
-        return True
+
+        return bool(limits[0] >= 0 and limits[-1] <= self.PointsPerWf - 1 and (np.diff(limits) > 0).all())
     
     def subinterval_is_well_formed(self,    i_low : int, 
                                             i_up : int) -> bool:
@@ -804,7 +1490,12 @@ class WaveformSet:
             parameter is given to the 
             'plot_analysis_markers' argument of the 
             WaveformAdcs.plot() method for each waveform in 
-            which will be plotted. 
+            which will be plotted. If it is False, then, 
+            for the sake of speed, the waveforms of each 
+            subplot are drawn as a single plotly trace, 
+            where consecutive waveforms are separated by 
+            NaN values, instead of calling WaveformAdcs.plot()
+            for each one of them.
                 If mode is set to 'average' and the
             'analysis_label' parameter is defined, then this
             parameter is given to the 'plot_analysis_markers'
@@ -879,12 +1570,14 @@ class WaveformSet:
         detailed_label : bool
             This parameter only makes a difference if
             the 'mode' parameter is set to 'average' or
-            'heatmap', respectively. If the 'mode' parameter
-            is set to 'average', then this parameter means
-            whether to show the iterator values of the two
-            first available waveforms (which were used to
-            compute the mean waveform) in the label of the
-            mean waveform plot. If the 'mode' parameter is 
+            'heatmap', or if it is set to 'overlay' and
+            'plot_analysis_markers' is False. If the 'mode' 
+            parameter is set to 'average' (resp. 'overlay'),
+            then this parameter means whether to show the 
+            iterator values of the two first available 
+            waveforms (which were used to compute the mean 
+            waveform) in the label of the mean waveform plot
+            (resp. the trace of each subplot). If the 'mode' parameter is 
             set to 'heatmap', then this parameter means 
             whether to show the iterator values of the two 
             first available waveforms (which were used to 
@@ -962,7 +1655,25 @@ class WaveformSet:
                                                                             # that alternative is only doable for 
                                                                             # the case where the given 'figure'
                                                                             # parameter is None.
-        if mode == 'overlay':
+        if mode == 'overlay' and not plot_analysis_markers:
+            for i in range(nrows):
+                for j in range(ncols):
+                    if len(data_of_map_of_wf_idcs[i][j]) > 0:
+
+                        aux_name = f"({i+1},{j+1}) - {len(data_of_map_of_wf_idcs[i][j])} Wf(s)"
+                        if detailed_label:
+                            aux_name += f": [{WaveformSet.get_string_of_first_n_integers_if_available(data_of_map_of_wf_idcs[i][j], queried_no = 2)}]"
+
+                        figure_.add_trace(  self.__get_overlay_trace(   data_of_map_of_wf_idcs[i][j],
+                                                                        name = aux_name),
+                                            row = i + 1,    # Plotly uses 1-based indexing
+                                            col = j + 1)
+                    else:
+                        
+                        WaveformSet.__add_no_data_annotation(   figure_,
+                                                                i + 1,
+                                                                j + 1)
+        elif mode == 'overlay':
             for i in range(nrows):
                 for j in range(ncols):
                     if len(data_of_map_of_wf_idcs[i][j]) > 0:
@@ -1124,6 +1835,54 @@ class WaveformSet:
         return np.array([   [time_range_lower_limit_,           time_range_upper_limit_         ],
                             [-1*abs(adc_range_below_baseline),  abs(adc_range_above_baseline)   ]])
 
+    def __get_overlay_trace(self,  wf_idcs : List[int],
+                                    name : Optional[str] = None) -> pgo.Scattergl:
+        
+        """
+        This method is not intended for user usage. It 
+        must only be called by WaveformSet.plot_wfs(). It 
+        returns a single plotly trace which draws every
+        waveform whose iterator value, with respect to this
+        WaveformSet, is given in wf_idcs. To do so, the 
+        rows of self.__adcs_matrix which match such 
+        waveforms are concatenated, with a NaN value after
+        each one of them, so that they are not joined by 
+        a line. As it happens in WaveformAdcs.plot(), each
+        waveform is displaced according to its TimeOffset,
+        and it is drawn as a thin black line.
+
+        Parameters
+        ----------
+        wf_idcs : list of int
+            The iterator values of the waveforms to draw.
+            It is the caller's responsibility to ensure 
+            that they are valid iterator values.
+        name : str
+            The name of the returned trace
+
+        Returns
+        ----------
+        output : plotly.graph_objects.Scattergl
+        """
+
+        time_offsets = np.fromiter( (self.__waveforms[k].TimeOffset for k in wf_idcs),
+                                    dtype = np.float32,
+                                    count = len(wf_idcs))
+        
+        x = np.full((len(wf_idcs), self.__points_per_wf + 1), np.nan, dtype = np.float32)
+        x[:, :-1] = np.arange(self.__points_per_wf, dtype = np.float32) + time_offsets[:, np.newaxis]
+
+        y = np.full((len(wf_idcs), self.__points_per_wf + 1), np.nan, dtype = np.float32)
+        y[:, :-1] = self.__adcs_matrix[wf_idcs]
+
+        return pgo.Scattergl(   x = x.ravel(),
+                                y = y.ravel(),
+                                mode = 'lines',
+                                line = dict(color = 'black',
+                                            width = 0.5),
+                                connectgaps = False,
+                                name = name)
+
     @staticmethod
     def get_string_of_first_n_integers_if_available(input_list : List[int],
                                                     queried_no : int = 3) -> str:
@@ -1154,21 +1913,9 @@ class WaveformSet:
             raise Exception(generate_exception_message( 1,
                                                         'WaveformSet.get_string_of_first_n_integers_if_available()',
                                                         f"The given queried_no ({queried_no}) must be positive."))
-        actual_no = queried_no
-        fAppend = True
-
-        if queried_no >= len(input_list):
-            actual_no = len(input_list)
-            fAppend = False
-
-        output = ''
+        output = ','.join(map(str, input_list[:queried_no]))
 
-        for i in range(actual_no):
-            output += (str(input_list[i])+',')
-
-        output = output[:-1] if not fAppend else (output[:-1] + ',...')
-
-        return output
+        return output + ',...' if queried_no < len(input_list) else output
     
     @staticmethod
     def update_shared_axes_status(  figure : pgo.Figure,
@@ -1202,21 +1949,31 @@ class WaveformSet:
         """
         
         try:
-            fig_rows, fig_cols = figure._get_subplot_rows_columns() # Returns two range objects
+            fig_rows, fig_cols = figure._get_subplot_rows_columns()
         except Exception:   # Happens if figure was not created using plotly.subplots.make_subplots
             raise Exception(generate_exception_message( 1,
                                                         'WaveformSet.update_shared_axes_status()',
                                                         'The given figure is not a subplot grid.'))
         
-        fig_rows, fig_cols = list(fig_rows)[-1], list(fig_cols)[-1]
-
-        aux_x = None if not share_x else 'x'
-        aux_y = None if not share_y else 'y'
+        aux = { 'x' : None if not share_x else 'x',
+                'y' : None if not share_y else 'y'}
         
-        for i in range(fig_rows):
-            for j in range(fig_cols):
-                figure.update_xaxes(matches=aux_x, row=i+1, col=j+1)
-                figure.update_yaxes(matches=aux_y, row=i+1, col=j+1)
+        updates = {}                                    # Gather every axis update, so that the layout is
+                                                        # validated once, instead of once per subplot
+        for row in fig_rows:
+            for col in fig_cols:
+
+                subplot = figure.get_subplot(row, col)  # None for the grid cells which host no subplot
+
+                for axis in (getattr(subplot, 'xaxis', None), getattr(subplot, 'yaxis', None)):
+
+                    if axis is None or not axis.plotly_name.startswith(('xaxis', 'yaxis')) \
+                        or figure.layout[axis.plotly_name] is not axis:     # Skip the non-cartesian subplots, p.e. polar
+                        continue                                            # ones, or 3D scenes, whose axes are not the
+                                                                            # figure.layout ones
+                    updates[axis.plotly_name + '_matches'] = aux[axis.plotly_name[0]]   # p.e. 'xaxis2_matches'
+
+        figure.update_layout(**updates)
 
         return figure
 
@@ -1225,14 +1982,18 @@ class WaveformSet:
                                     wfs_per_axes : Optional[int] = None,
                                     wf_filter : Optional[Callable[..., bool]] = None,
                                     filter_args : Optional[Map] = None,
-                                    max_wfs_per_axes : Optional[int] = 5) -> Map:
+                                    max_wfs_per_axes : Optional[int] = 5,
+                                    return_ndarray : bool = False) -> Map:
         
         """
         This method returns a Map of lists of integers,
         i.e. a Map object whose Type attribute equals 
         list. The contained integers should be interpreted 
         as iterator values for waveforms in this WaveformSet 
-        object.
+        object. If return_ndarray is True, then the entries
+        of the returned Map are unidimensional numpy arrays
+        of integers instead (see the return_ndarray parameter
+        documentation).
 
         Parameters
         ----------
@@ -1290,12 +2051,20 @@ class WaveformSet:
             whole WaveformSet for every i,j pair. Note that 
             setting this parameter to None may result in a 
             long execution time for big waveform sets.
+        return_ndarray : bool
+            If True, then the Type attribute of the returned
+            Map is numpy.ndarray, and output.Data[i][j] is an
+            unidimensional numpy array of np.int64 integers,
+            which can be directly used to fancy-index the 
+            waveforms of this WaveformSet in its ADCs matrix.
 
         Returns
         ----------
         output : Map
-            It is a Map object whose Type attribute is list.
-            Namely, output.Data[i][j] is a list of integers.
+            It is a Map object whose Type attribute is list
+            (resp. numpy.ndarray, if return_ndarray is True).
+            Namely, output.Data[i][j] is a list (resp. an 
+            unidimensional numpy array) of integers.
             If the 'wfs_per_axes' parameter is defined, then
             the iterator values contained in the output Map 
             are contiguous in [0, nrows*ncols*wfs_per_axes - 1].
@@ -1328,14 +2097,13 @@ class WaveformSet:
         if fFilteringMode:
 
             try:
-                signature = inspect.signature(wf_filter)
+                WaveformSet.__check_wf_filter(wf_filter)    # Cached, so the signature of a given
+                                                            # filter is only inspected once
             except TypeError:
                 raise Exception(generate_exception_message( 3,
                                                             'WaveformSet.get_map_of_wf_idcs()',
                                                             "The given wf_filter is not defined or is not callable. It must be suitably defined because the 'wfs_per_axes' parameter is not. At least one of them must be suitably defined."))
 
-            WaveformSet.check_well_formedness_of_generic_waveform_function(signature)
-
             if filter_args is None:
                 raise Exception(generate_exception_message( 4,
                                                             'WaveformSet.get_map_of_wf_idcs()',
@@ -1358,6 +2126,15 @@ class WaveformSet:
 
         if not fFilteringMode:
 
+            if return_ndarray:
+
+                aux = np.arange(nrows*ncols*wfs_per_axes,
+                                dtype = np.int64).reshape(nrows, ncols, wfs_per_axes)
+                return Map( nrows,
+                            ncols,
+                            np.ndarray,
+                            data = [[aux[i, j] for j in range(ncols)] for i in range(nrows)])
+
             return WaveformSet.get_contiguous_indices_map(  wfs_per_axes,
                                                             nrows = nrows,
                                                             ncols = ncols)
@@ -1365,12 +2142,7 @@ class WaveformSet:
         else:   # fFilteringMode is True and so, wf_filter, 
                 # filter_args and fMaxIsSet are defined
 
-            mode_map = {WaveformSet.match_run : 0,
-                        WaveformSet.match_endpoint_and_channel : 1}
-            try:
-                fMode = mode_map[wf_filter]
-            except KeyError:
-                fMode = 2
+            fMode = WaveformSet.__filter_modes.get(wf_filter, 2)
 
             output = Map.from_unique_value( nrows,
                                             ncols,
@@ -1378,21 +2150,27 @@ class WaveformSet:
                                             [],
                                             independent_copies = True)
             if fMode == 0:
-                return self.__get_map_of_wf_idcs_by_run(output,
-                                                        filter_args,
-                                                        fMaxIsSet,
-                                                        max_wfs_per_axes)
+                output = self.__get_map_of_wf_idcs_by_run(  output,
+                                                            filter_args,
+                                                            fMaxIsSet,
+                                                            max_wfs_per_axes)
             elif fMode == 1:
-                return self.__get_map_of_wf_idcs_by_endpoint_and_channel(   output,
+                output = self.__get_map_of_wf_idcs_by_endpoint_and_channel( output,
                                                                             filter_args,
                                                                             fMaxIsSet,
                                                                             max_wfs_per_axes)
             else:
-                return self.__get_map_of_wf_idcs_general(   output,
+                output = self.__get_map_of_wf_idcs_general( output,
                                                             wf_filter,
                                                             filter_args,
                                                             fMaxIsSet,
                                                             max_wfs_per_axes)
+            if return_ndarray:
+                return Map( nrows,
+                            ncols,
+                            np.ndarray,
+                            data = [[np.array(idcs, dtype = np.int64) for idcs in row] for row in output.Data])
+            return output
 
     @staticmethod
     def match_run(  waveform : Waveform,
@@ -1480,6 +2258,127 @@ class WaveformSet:
 
         return waveform.Endpoint == endpoint and waveform.Channel == channel
     
+    @staticmethod
+    @numba.njit(nogil=True, parallel=False)
+    def __match_endpoint_njit(  runs : np.ndarray,
+                                endpoints : np.ndarray,
+                                channels : np.ndarray,
+                                timestamps : np.ndarray,
+                                endpoint : int) -> np.ndarray:
+        
+        """
+        Numba-compiled counterpart of WaveformSet.match_endpoint(),
+        which evaluates it over the per-waveform columns of a 
+        WaveformSet at once. Check the WaveformSet.register_njit_filter()
+        docstring for more information.
+
+        Returns
+        ----------
+        output : unidimensional numpy array of bool
+        """
+
+        return endpoints == endpoint
+    
+    @staticmethod
+    @numba.njit(nogil=True, parallel=False)
+    def __match_channel_njit(   runs : np.ndarray,
+                                endpoints : np.ndarray,
+                                channels : np.ndarray,
+                                timestamps : np.ndarray,
+                                channel : int) -> np.ndarray:
+        
+        """
+        Numba-compiled counterpart of WaveformSet.match_channel(),
+        which evaluates it over the per-waveform columns of a 
+        WaveformSet at once. Check the WaveformSet.register_njit_filter()
+        docstring for more information.
+
+        Returns
+        ----------
+        output : unidimensional numpy array of bool
+        """
+
+        return channels == channel
+    
+    __njit_filters = {  match_endpoint.__func__ : __match_endpoint_njit.__func__,     # Maps a waveform filter to its registered numba-compiled
+                        match_channel.__func__ : __match_channel_njit.__func__ }      # counterpart (see WaveformSet.register_njit_filter())
+    
+    __filter_modes = {  match_run.__func__ : 0,                     # Filters which have a dedicated implementation
+                        match_endpoint_and_channel.__func__ : 1 }   # in WaveformSet.get_map_of_wf_idcs(). Any other 
+                                                                    # filter is handled by the general mode (2).
+    @staticmethod
+    @functools.lru_cache(maxsize = 128)
+    def __check_wf_filter(wf_filter : Callable[..., bool]) -> None:
+
+        """
+        This method is not intended for user usage. It 
+        inspects the signature of the given waveform filter
+        and checks it via 
+        WaveformSet.check_well_formedness_of_generic_waveform_function().
+        Since the result only depends on the given filter,
+        it is memoized, so that the signature of a filter
+        which is used repeatedly (p.e. in interactive
+        plotting, or through WaveformSet.get_map_of_wf_idcs(),
+        WaveformSet.filter() and WaveformSet.compute_mean_waveform())
+        is only inspected once. Since exceptions
+        are not memoized, an ill-formed filter is reported
+        in every call.
+
+        Parameters
+        ----------
+        wf_filter : callable
+
+        Returns
+        ----------
+        None
+        """
+
+        WaveformSet.check_well_formedness_of_generic_waveform_function(inspect.signature(wf_filter))
+        return
+    
+    @staticmethod
+    def register_njit_filter(   wf_filter : Callable[..., bool],
+                                njit_filter : Callable[..., np.ndarray]) -> None:
+        
+        """
+        This method registers njit_filter as the vectorized,
+        numba-compiled counterpart of wf_filter. Once it is 
+        registered, whenever wf_filter is given to the 
+        'wf_filter' parameter of WaveformSet.get_map_of_wf_idcs(),
+        or to the 'wf_selector' parameter of 
+        WaveformSet.compute_mean_waveform() with no keyword 
+        arguments, njit_filter is run over the per-waveform 
+        columns of the WaveformSet, instead of calling wf_filter
+        for each waveform. WaveformSet.match_endpoint() and 
+        WaveformSet.match_channel() are registered by default.
+
+        Parameters
+        ----------
+        wf_filter : callable
+            A waveform filter, as expected by the 'wf_filter'
+            parameter of WaveformSet.get_map_of_wf_idcs()
+        njit_filter : callable
+            A numba.njit-decorated function whose signature is
+            njit_filter(runs, endpoints, channels, timestamps, *args),
+            where runs, endpoints, channels and timestamps are 
+            unidimensional numpy arrays whose i-th entries are 
+            the RunNumber, Endpoint, Channel and Timestamp of 
+            the i-th waveform, respectively. It must return a
+            boolean numpy array whose i-th entry matches 
+            wf_filter(waveform_i, *args).
+
+        Returns
+        ----------
+        None
+        """
+
+        if not isinstance(njit_filter, numba.core.registry.CPUDispatcher):
+            raise Exception(generate_exception_message( 1,
+                                                        'WaveformSet.register_njit_filter()',
+                                                        'The given njit_filter must be decorated with numba.njit.'))
+        WaveformSet.__njit_filters[wf_filter] = njit_filter
+        return
+    
     def __get_map_of_wf_idcs_by_run(self,   blank_map : Map,
                                             filter_args : Map,
                                             fMaxIsSet : bool,
@@ -1507,32 +2406,29 @@ class WaveformSet:
         Map
         """
 
+        cells_by_run = {}   # Several cells may ask for the same run, so the
+                            # waveforms of each run are only looked up once
         for i in range(blank_map.Rows):
             for j in range(blank_map.Columns):
 
-                if filter_args.Data[i][j][0] not in self.__runs:
+                run = filter_args.Data[i][j][0]
+
+                if run not in self.__runs:
                     continue
 
-                if fMaxIsSet:   # blank_map should not be very big (visualization purposes)
-                                # so we can afford evaluating the fMaxIsSet conditional here
-                                # instead of at the beginning of the method (which would
-                                # be more efficient but would entail a more extensive code)
+                cells_by_run.setdefault(run, []).append((i, j))
 
-                    counter = 0
-                    for k in range(len(self.__waveforms)):
-                        if WaveformSet.match_run(   self.__waveforms[k],
-                                                    *filter_args.Data[i][j]):
-                            
-                            blank_map.Data[i][j].append(k)
-                            counter += 1
-                            if counter == max_wfs_per_axes:
-                                break
-                else:
-                    for k in range(len(self.__waveforms)):
-                        if WaveformSet.match_run(   self.__waveforms[k],
-                                                    *filter_args.Data[i][j]):
-                            
-                            blank_map.Data[i][j].append(k)
+        for run, cells in cells_by_run.items():
+
+            idcs = self.get_idcs(run = run)     # Vectorized comparison over the runs column, instead
+                                                # of calling WaveformSet.match_run() per waveform
+            if fMaxIsSet:
+                idcs = idcs[:max_wfs_per_axes]
+
+            idcs = idcs.tolist()
+
+            for i, j in cells:
+                blank_map.Data[i][j].extend(idcs)
         return blank_map
     
     def __get_map_of_wf_idcs_by_endpoint_and_channel(self,  blank_map : Map,
@@ -1563,37 +2459,23 @@ class WaveformSet:
         Map
         """
 
-        aux = self.get_run_collapsed_available_channels()
+        aux = self.__get_idcs_by_endpoint_and_channel()
 
         for i in range(blank_map.Rows):
             for j in range(blank_map.Columns):
 
-                if filter_args.Data[i][j].Endpoint not in aux.keys():
-                    continue
+                unique_channel = filter_args.Data[i][j]
+
+                idcs = aux.get((unique_channel.Endpoint,    # A missing key means that there are
+                                unique_channel.Channel))    # no waveforms for this channel
 
-                elif filter_args.Data[i][j].Channel not in aux[filter_args.Data[i][j].Endpoint]:
-                    continue    
+                if idcs is None:
+                    continue
           
-                if fMaxIsSet:   # blank_map should not be very big (visualization purposes)
-                                # so we can afford evaluating the fMaxIsSet conditional here
-                                # instead of at the beginning of the method (which would
-                                # be more efficient but would entail a more extensive code)
+                if fMaxIsSet:
+                    idcs = idcs[:max_wfs_per_axes]
 
-                    counter = 0
-                    for k in range(len(self.__waveforms)):
-                        if WaveformSet.match_endpoint_and_channel(  self.__waveforms[k],
-                                                                    filter_args.Data[i][j].Endpoint,
-                                                                    filter_args.Data[i][j].Channel):
-                            blank_map.Data[i][j].append(k)
-                            counter += 1
-                            if counter == max_wfs_per_axes:
-                                break
-                else:
-                    for k in range(len(self.__waveforms)):
-                        if WaveformSet.match_endpoint_and_channel(  self.__waveforms[k],
-                                                                    filter_args.Data[i][j].Endpoint,
-                                                                    filter_args.Data[i][j].Channel):
-                            blank_map.Data[i][j].append(k)
+                blank_map.Data[i][j].extend(idcs.tolist())
         return blank_map
     
     def __get_map_of_wf_idcs_general(self,  blank_map : Map,
@@ -1627,24 +2509,51 @@ class WaveformSet:
         list of list of list of int
         """
 
+        njit_filter = WaveformSet.__njit_filters.get(wf_filter)
+
+        if njit_filter is not None:     # Evaluate the registered numba-compiled
+                                        # counterpart over the columns at once
+            runs, endpoints, channels, timestamps = (   self.__runs_per_wf,
+                                                        self.__endpoints,
+                                                        self.__channels,
+                                                        self.__timestamps)
+            for i in range(blank_map.Rows):
+                for j in range(blank_map.Columns):
+
+                    idcs = np.flatnonzero(njit_filter(  runs,
+                                                        endpoints,
+                                                        channels,
+                                                        timestamps,
+                                                        *filter_args.Data[i][j]))
+                    if fMaxIsSet:
+                        idcs = idcs[:max_wfs_per_axes]
+
+                    blank_map.Data[i][j].extend(idcs.tolist())
+            return blank_map
+
+        waveforms = self.__waveforms    # Bind these as locals, so that they are not
+                                        # looked up again in every iteration of the
+                                        # innermost loops, which run over every waveform
         for i in range(blank_map.Rows):
             for j in range(blank_map.Columns):
 
+                append = blank_map.Data[i][j].append
+                args = tuple(filter_args.Data[i][j])    # Unpacking an exact tuple via *args reuses it,
+                                                        # whereas a list is re-tupled in every call
+
                 if fMaxIsSet:
                     counter = 0
-                    for k in range(len(self.__waveforms)):
-                        if wf_filter(   self.__waveforms[k],
-                                        *filter_args.Data[i][j]):
+                    for k, wf in enumerate(waveforms):
+                        if wf_filter(wf, *args):
                             
-                            blank_map.Data[i][j].append(k)
+                            append(k)
                             counter += 1
                             if counter == max_wfs_per_axes:
                                 break
                 else:
-                    for k in range(len(self.__waveforms)):
-                        if wf_filter(   self.__waveforms[k],
-                                        *filter_args.Data[i][j]):
-                            blank_map.Data[i][j].append(k)
+                    for k, wf in enumerate(waveforms):
+                        if wf_filter(wf, *args):
+                            append(k)
         return blank_map
                             
     @staticmethod
@@ -1673,7 +2582,9 @@ class WaveformSet:
                                                         'WaveformSet.get_2D_empty_nested_list()',
                                                         'The number of rows and columns must be positive.'))
 
-        return [[[] for _ in range(ncols)] for _ in range(nrows)]
+        aux = [[] for _ in range(nrows * ncols)]   # Build every cell in a single flat pass, then
+                                                    # split it into rows via slicing, which happens
+        return [aux[i : i + ncols] for i in range(0, nrows * ncols, ncols)]    # at C level
     
     @staticmethod
     def get_contiguous_indices_map( indices_per_slot : int,
@@ -1725,6 +2636,99 @@ class WaveformSet:
                     list,
                     data = aux)
 
+    @classmethod
+    def from_arrays(cls,    timestamps : np.ndarray,
+                            adcs_matrix : np.ndarray,
+                            record_numbers : np.ndarray,
+                            endpoints : np.ndarray,
+                            channels : np.ndarray,
+                            time_step_ns : float = 16.,
+                            run_number : int = 0,
+                            time_offsets : Optional[np.ndarray] = None) -> 'WaveformSet':
+
+        """
+        Alternative initializer for a WaveformSet object out of
+        per-waveform columns, i.e. the i-th waveform of the
+        returned WaveformSet takes the i-th entry of each one of
+        the given arrays. The given ADCs matrix is adopted as 
+        the ADCs matrix of the returned WaveformSet, i.e. the 
+        Adcs attribute of each waveform is a view of its row,
+        so that the readout is not copied. The given columns 
+        are also adopted as the ones which WaveformSet uses 
+        for vectorized selections (see WaveformSet.get_idcs()),
+        so that, unlike the WaveformSet initializer, the 
+        Waveform objects are only iterated once, to create 
+        them.
+
+        Parameters
+        ----------
+        timestamps : unidimensional numpy array of int
+        adcs_matrix : bidimensional numpy array
+            Its i-th row is the Adcs attribute of the i-th
+            waveform. It is adopted without copying it as 
+            long as it is C-contiguous and it is not the 
+            ADCs matrix of another WaveformSet. Otherwise, 
+            it is copied once.
+        record_numbers : unidimensional numpy array of int
+        endpoints : unidimensional numpy array of int
+        channels : unidimensional numpy array of int
+        time_step_ns : float
+            The TimeStep_ns attribute of every waveform
+        run_number : int
+            The RunNumber attribute of every waveform
+        time_offsets : unidimensional numpy array of int
+            If it is None, then the TimeOffset attribute of
+            every waveform is set to 0.
+
+        Returns
+        ----------
+        WaveformSet
+        """
+
+        if np.ndim(adcs_matrix) != 2:
+            raise Exception(generate_exception_message( 1,
+                                                        'WaveformSet.from_arrays()',
+                                                        f"The given adcs_matrix must be bidimensional, but it has {np.ndim(adcs_matrix)} dimension(s)."))
+        
+        time_offsets = np.zeros((len(adcs_matrix),), dtype = np.int64) if time_offsets is None else np.asarray(time_offsets)
+        columns = [np.asarray(column) for column in (timestamps, record_numbers, endpoints, channels, time_offsets)]
+
+        if any(len(column) != len(adcs_matrix) for column in columns):
+            raise Exception(generate_exception_message( 2,
+                                                        'WaveformSet.from_arrays()',
+                                                        f"Every given column must have as many entries as rows in adcs_matrix ({len(adcs_matrix)})."))
+        if len(adcs_matrix) == 0:
+            raise Exception(generate_exception_message( 3,
+                                                        'WaveformSet.from_arrays()',
+                                                        'There must be at least one waveform in the set.'))
+        
+        timestamps, record_numbers, endpoints, channels, time_offsets = columns
+
+        adcs_matrix = np.ascontiguousarray(adcs_matrix)     # Otherwise, its rows could not be adopted
+
+        if WaveformSet.__is_backed_by_a_set(adcs_matrix):   # Otherwise, the new waveforms would be backed by the matrix of
+            adcs_matrix = adcs_matrix.copy()                # another WaveformSet, which does not match the new one
+
+        output = cls.__new__(cls)
+
+        output.__waveforms = WaveformSet.__build_waveforms_list_from_columns(   timestamps,
+                                                                                time_step_ns,
+                                                                                adcs_matrix,
+                                                                                run_number,
+                                                                                record_numbers,
+                                                                                endpoints,
+                                                                                channels,
+                                                                                time_offsets.tolist())
+        output.__points_per_wf = adcs_matrix.shape[1]
+
+        output.__set_up(adcs_matrix,
+                        endpoints.astype(np.int32),
+                        channels.astype(np.int32),
+                        np.full((len(adcs_matrix),), run_number, dtype = np.int32),
+                        record_numbers.astype(np.int64),
+                        timestamps.astype(np.int64))
+        return output
+
     @classmethod
     def from_ROOT_file(cls, filepath : str,
                             bulk_data_tree_name : str = 'raw_waveforms',
@@ -1874,7 +2878,7 @@ class WaveformSet:
             meta_data_tree = None           ## To enable compatibility with old runs when the meta data tree was not defined, we are handling 
                                             ## this exception here. This can be done for now, because we are not reading yet any information 
                                             ## from such tree, but setting meta_data_tree to None (i.e. passing None to 
-                                            ## __build_waveforms_list_from_ROOT_file_using_uproot or 
+                                            ## __read_columns_from_ROOT_file_using_uproot or 
                                             ## __build_waveforms_list_from_ROOT_file_using_pyroot) will be unacceptable in the near future.
 
         bulk_data_tree, _ = WaveformSet.find_TTree_in_ROOT_TFile(   input_file,
@@ -1914,12 +2918,31 @@ class WaveformSet:
                                                         f"No waveforms of the specified type ({'full-stream' if read_full_streaming_data else 'self-trigger'}) were found."))
         if library == 'uproot':
 
-            waveforms = WaveformSet.__build_waveforms_list_from_ROOT_file_using_uproot( aux,
-                                                                                        bulk_data_tree,
-                                                                                        meta_data_tree,
-                                                                                        set_offset_wrt_daq_window = set_offset_wrt_daq_window,
-                                                                                        first_wf_index = wf_start,
-                                                                                        verbose = verbose)
+            timestamps, adcs, record_numbers, endpoints, channels, time_offsets = WaveformSet.__read_columns_from_ROOT_file_using_uproot(  aux,
+                                                                                                                                            bulk_data_tree,
+                                                                                                                                            meta_data_tree,
+                                                                                                                                            set_offset_wrt_daq_window = set_offset_wrt_daq_window,
+                                                                                                                                            first_wf_index = wf_start,
+                                                                                                                                            verbose = verbose)
+            if isinstance(adcs, list):      # The read waveforms do not have the same length
+
+                if not truncate_wfs_to_minimum:
+                    raise Exception(generate_exception_message( 4,
+                                                                'WaveformSet.from_ROOT_file()',
+                                                                "The length of the read waveforms is not homogeneous. Set the 'truncate_wfs_to_minimum' parameter to True to truncate them to the minimum length."))
+                
+                minimum_length = min(len(wf_adcs) for wf_adcs in adcs)
+                adcs = np.stack([wf_adcs[:minimum_length] for wf_adcs in adcs])
+
+            return cls.from_arrays( timestamps,             # Build the WaveformSet straight out of the read columns
+                                    adcs,
+                                    record_numbers,
+                                    endpoints,
+                                    channels,
+                                    time_step_ns = 16.,     ## Hardcoded to 16 ns for now, but it must be implemented
+                                                            ## from the new 'metadata' TTree in the ROOT file
+                                    run_number = 0,         ## To be implemented from the new 'metadata' TTree in the ROOT file
+                                    time_offsets = time_offsets)
         else:
         
             waveforms = WaveformSet.__build_waveforms_list_from_ROOT_file_using_pyroot( aux,
@@ -1939,19 +2962,24 @@ class WaveformSet:
         return cls(*waveforms)
     
     @staticmethod
-    def __build_waveforms_list_from_ROOT_file_using_uproot( idcs_to_retrieve : np.ndarray,
-                                                            bulk_data_tree : uproot.TTree,
-                                                            meta_data_tree : uproot.TTree,
-                                                            set_offset_wrt_daq_window : bool = False,
-                                                            first_wf_index : int = 0,
-                                                            verbose : bool = True) -> List[Waveform]:
+    def __read_columns_from_ROOT_file_using_uproot( idcs_to_retrieve : np.ndarray,
+                                                    bulk_data_tree : uproot.TTree,
+                                                    meta_data_tree : uproot.TTree,
+                                                    set_offset_wrt_daq_window : bool = False,
+                                                    first_wf_index : int = 0,
+                                                    verbose : bool = True) -> Tuple[np.ndarray, Union[np.ndarray, List[np.ndarray]], np.ndarray, np.ndarray, np.ndarray, List[int]]:
         
         """
         This is a helper method which must only be called by the 
         WaveformSet.from_ROOT_file() class method. This method
         reads a subset of waveforms from the given uproot.TTree
-        and appends them one by one to a list of Waveform
-        objects, which is finally returned by this method.
+        as numpy arrays, and returns them as per-waveform 
+        columns, out of which WaveformSet.from_ROOT_file() 
+        builds the WaveformSet via WaveformSet.from_arrays().
+        If every read waveform has the same length, then their
+        Adcs are stored in a single bidimensional array, which
+        is adopted as the ADCs matrix of such WaveformSet 
+        without copying the readout again.
         When the uproot library is specified, WaveformSet.from_ROOT_file()
         delegates such task to this helper method.
 
@@ -1990,15 +3018,24 @@ class WaveformSet:
 
         Returns
         ----------
-        waveforms : list of Waveform
+        timestamps : unidimensional numpy array of int
+        adcs : bidimensional numpy array, or list of unidimensional numpy arrays
+            It is a bidimensional array whose i-th row is the
+            readout of the i-th waveform, if every read 
+            waveform has the same length. It is a list of 
+            one array per waveform if else.
+        record_numbers : unidimensional numpy array of int
+        endpoints : unidimensional numpy array of int
+        channels : unidimensional numpy array of int
+        time_offsets : list of int
         """
 
         clustered_idcs_to_retrieve = WaveformSet.cluster_integers_by_contiguity(idcs_to_retrieve)
 
         if verbose:
 
-            print(f"In function WaveformSet.__build_waveforms_list_from_ROOT_file_using_uproot(): Found {len(clustered_idcs_to_retrieve)} cluster(s) of contiguous waveforms of the selected type (self-trigger or full-stream) in the ROOT file.")
-            print(f"In function WaveformSet.__build_waveforms_list_from_ROOT_file_using_uproot(): Note that, the lesser the clusters the faster the reading process will be.")
+            print(f"In function WaveformSet.__read_columns_from_ROOT_file_using_uproot(): Found {len(clustered_idcs_to_retrieve)} cluster(s) of contiguous waveforms of the selected type (self-trigger or full-stream) in the ROOT file.")
+            print(f"In function WaveformSet.__read_columns_from_ROOT_file_using_uproot(): Note that, the lesser the clusters the faster the reading process will be.")
 
         # For reference, reading ~1.6e+3 waveforms in 357 clusters takes ~10s,
         # while reading ~176e+3 waveforms in 1 cluster takes the same ~10s.
@@ -2038,93 +3075,159 @@ class WaveformSet:
                                                                     'record',
                                                                     library = 'uproot')
 
-        waveforms = []                      # Using a list comprehension here is slightly slower than a for loop
-                                            # (97s vs 102s for 5% of wvfs of a 809 MB file running on lxplus9)
+        branches = [adcs_branch, channel_branch, timestamp_branch, record_branch]
 
-        if not set_offset_wrt_daq_window:   # Code is more extensive this way, but faster than evaluating
-                                            # the conditional at each iteration within the loop.
+        if set_offset_wrt_daq_window:
+
+            daq_timestamp_branch, _ = WaveformSet.find_TBranch_in_ROOT_TTree(   bulk_data_tree,
+                                                                                'daq_timestamp',
+                                                                                library = 'uproot')
+            branches.append(daq_timestamp_branch)
+
+        blocks = [[] for _ in branches]
 
+        decompression_executor = uproot.ThreadPoolExecutor()       # Decompress (resp. interpret) the baskets of
+        interpretation_executor = uproot.ThreadPoolExecutor()      # each read in parallel. Two different pools are
+                                                                    # used, since interpretation tasks wait for the
+        try:                                                        # decompression ones.
             for interval in clustered_idcs_to_retrieve:     # Read the waveforms in contiguous blocks
 
                 branch_start = first_wf_index + interval[0]
                 branch_stop = first_wf_index + interval[1]
 
-                current_adcs_array = adcs_branch.array( entry_start = branch_start,     # It is slightly faster (~106s vs. 114s,
-                                                        entry_stop = branch_stop)       # for a 809 MB input file running on lxplus9)
-                                                                                        # to read branch by branch rather than going
-                                                                                        # for bulk_data_tree.arrays()
-
-                current_channel_array = channel_branch.array(   entry_start = branch_start,
-                                                                entry_stop = branch_stop)
-                
-                current_timestamp_array = timestamp_branch.array(   entry_start = branch_start,
-                                                                    entry_stop = branch_stop)
-                
-                current_record_array = record_branch.array( entry_start = branch_start,
-                                                            entry_stop = branch_stop)
-                for i in range(len(current_adcs_array)):
-
-                    endpoint, channel = WaveformSet.get_endpoint_and_channel(current_channel_array[i])
-
-                    waveforms.append(Waveform(  current_timestamp_array[i],
-                                                16.,    # TimeStep_ns   ## Hardcoded to 16 ns for now, but
-                                                                        ## it must be implemented from the new
-                                                                        ## 'metadata' TTree in the ROOT file
-                                                np.array(current_adcs_array[i]),
-                                                0,      #RunNumber      ## To be implemented from the new
-                                                                        ## 'metadata' TTree in the ROOT file
-                                                current_record_array[i],
-                                                endpoint,
-                                                channel,
-                                                time_offset = 0))
+                for branch, branch_blocks in zip(branches, blocks):     # It is slightly faster (~106s vs. 114s, for a 809 MB
+                                                                        # input file running on lxplus9) to read branch by 
+                                                                        # branch rather than going for bulk_data_tree.arrays()
+                    branch_blocks.append(branch.array(  entry_start = branch_start,
+                                                        entry_stop = branch_stop,
+                                                        decompression_executor = decompression_executor,
+                                                        interpretation_executor = interpretation_executor,
+                                                        library = 'np'))
+        finally:
+            decompression_executor.shutdown()
+            interpretation_executor.shutdown()
+
+        adcs_array, channel_array, timestamp_array, record_array = [np.concatenate(branch_blocks) for branch_blocks in blocks[:4]]
+
+        if len({len(adcs) for adcs in adcs_array}) == 1:    # Store the readout in a single contiguous matrix, which
+                                                            # WaveformSet.from_arrays() adopts as the ADCs matrix
+            adcs_array = np.stack(adcs_array)               # without copying the readout again
+            
+            adcs_dtype = WaveformSet.__get_lossless_adcs_dtype(adcs_array, verbose = verbose)
+            adcs_array = adcs_array.astype(adcs_dtype, copy = False)
         else:
+            if verbose:
+                print(f"In function WaveformSet.__read_columns_from_ROOT_file_using_uproot(): The read waveforms do not have the same length, so their ADCs cannot be stored in a single matrix yet.")
+                print(f"In function WaveformSet.__read_columns_from_ROOT_file_using_uproot(): They will only be gathered into a contiguous matrix if they are truncated to a common length (see the 'truncate_wfs_to_minimum' parameter of WaveformSet.from_ROOT_file()).")
+
+            adcs_dtype = WaveformSet.__get_lossless_adcs_dtype(np.concatenate(adcs_array), verbose = verbose)
+            adcs_array = [np.array(adcs, dtype = adcs_dtype) for adcs in adcs_array]    # Non-homogeneous lengths: one array per waveform, as 
+                                                                                        # they may still be truncated by WaveformSet.from_ROOT_file()
+        if set_offset_wrt_daq_window:
+            time_offsets = WaveformSet.reference_to_minimum((timestamp_array.astype(np.int64) - np.concatenate(blocks[4]).astype(np.int64)).tolist())
+        else:
+            time_offsets = [0] * len(adcs_array)
 
-            raw_time_offsets = []
+        endpoint_array, channel_array = np.divmod(channel_array.astype(np.int64), 100)    # Vectorized version of WaveformSet.get_endpoint_and_channel()
+                                                                                            # (the last two digits give the channel, the rest the endpoint)
 
-            daq_timestamp_branch, _ = WaveformSet.find_TBranch_in_ROOT_TTree(   bulk_data_tree,
-                                                                                'daq_timestamp',
-                                                                                library = 'uproot')
-                        
-            for interval in clustered_idcs_to_retrieve:     # Read the waveforms in contiguous blocks
+        return timestamp_array, adcs_array, record_array, endpoint_array, channel_array, time_offsets
+    
+    @staticmethod
+    def __get_lossless_adcs_dtype(  adcs : np.ndarray,
+                                    verbose : bool = True) -> np.dtype:
+        
+        """
+        This method is not intended for user usage. It 
+        returns the data type in which the given ADCs 
+        should be stored. The readout of the DAPHNE boards
+        is made of 14-bit integers, so it is stored as 
+        np.int16, which takes a fourth of the memory of 
+        int64/float64. However, such narrowing is only done
+        if it is lossless, i.e. if the given array is of an
+        integer type and every entry fits in the int16 
+        range. Otherwise, p.e. for a corrupted sample or a 
+        different digitizer, the data type of the given 
+        array is returned, so that no entry wraps around.
 
-                branch_start = first_wf_index + interval[0]
-                branch_stop = first_wf_index + interval[1]
+        Parameters
+        ----------
+        adcs : numpy array
+            The ADCs read from the ROOT file
+        verbose : bool
+            Whether to print a message if the ADCs cannot
+            be narrowed to np.int16
 
-                current_adcs_array = adcs_branch.array( entry_start = branch_start,
-                                                        entry_stop = branch_stop)
-                
-                current_channel_array = channel_branch.array(   entry_start = branch_start,
-                                                                entry_stop = branch_stop)
-                
-                current_timestamp_array = timestamp_branch.array(   entry_start = branch_start,
-                                                                    entry_stop = branch_stop)
-                
-                current_record_array = record_branch.array( entry_start = branch_start,
-                                                            entry_stop = branch_stop)
-                
-                current_daq_timestamp_array = daq_timestamp_branch.array(   entry_start = branch_start,
-                                                                            entry_stop = branch_stop)
+        Returns
+        ----------
+        dtype : numpy.dtype
+        """
 
-                for i in range(len(current_adcs_array)):
+        limits = np.iinfo(np.int16)
 
-                    endpoint, channel = WaveformSet.get_endpoint_and_channel(current_channel_array[i])
+        if np.issubdtype(adcs.dtype, np.integer) and (adcs.size == 0 or (adcs.min() >= limits.min and adcs.max() <= limits.max)):
+            return np.dtype(np.int16)
+        
+        if verbose:
+            print(f"In function WaveformSet.__get_lossless_adcs_dtype(): The read ADCs do not fit in np.int16, so they are kept as {adcs.dtype}.")
 
-                    waveforms.append(Waveform(  current_timestamp_array[i],
-                                                16.,    # TimeStep_ns
-                                                np.array(current_adcs_array[i]),
-                                                0,      #RunNumber
-                                                current_record_array[i],
-                                                endpoint,
-                                                channel,
-                                                time_offset = 0))
-                    
-                    raw_time_offsets.append(int(current_timestamp_array[i]) - int(current_daq_timestamp_array[i]))
+        return adcs.dtype
+    
+    @staticmethod
+    def __build_waveforms_list_from_columns(timestamps : np.ndarray,
+                                            time_step_ns : float,
+                                            adcs : Union[np.ndarray, List[np.ndarray]],
+                                            run_number : int,
+                                            record_numbers : np.ndarray,
+                                            endpoints : np.ndarray,
+                                            channels : np.ndarray,
+                                            time_offsets : List[int]) -> List[Waveform]:
+        
+        """
+        This method is not intended for user usage. It
+        builds one Waveform object per entry of the given
+        columns, where the i-th waveform takes the i-th
+        entry of each column, and returns them in a list. 
+        If adcs is a bidimensional numpy array, then the 
+        Adcs attribute of each waveform is a view of its 
+        row, so that WaveformSet.from_arrays() adopts such
+        matrix without copying it. The well-formedness
+        of the columns must have been checked beforehand.
 
-            time_offsets = WaveformSet.reference_to_minimum(raw_time_offsets)
+        Parameters
+        ----------
+        timestamps (resp. record_numbers, endpoints, 
+        channels) : unidimensional numpy array of int
+        time_step_ns : float
+            The TimeStep_ns attribute of every waveform
+        adcs : bidimensional numpy array, or list of 
+        unidimensional numpy arrays
+        run_number : int
+            The RunNumber attribute of every waveform
+        time_offsets : list of int
 
-            for i in range(len(waveforms)):
-                waveforms[i]._WaveformAdcs__set_time_offset(time_offsets[i])
+        Returns
+        ----------
+        waveforms : list of Waveform
+        """
 
+        waveforms = []                      # Using a list comprehension here is slightly slower than a for loop
+                                            # (97s vs 102s for 5% of wvfs of a 809 MB file running on lxplus9)
+
+        for timestamp, adcs_, record, endpoint, channel, time_offset in zip(timestamps.tolist(),     # Convert the metadata columns to
+                                                                            adcs,                   # python integers at once, instead
+                                                                            record_numbers.tolist(),# of indexing numpy arrays per waveform
+                                                                            endpoints.tolist(),
+                                                                            channels.tolist(),
+                                                                            time_offsets):
+            waveforms.append(Waveform(  timestamp,
+                                        time_step_ns,
+                                        adcs_,
+                                        run_number,
+                                        record,
+                                        endpoint,
+                                        channel,
+                                        time_offset = time_offset))
         return waveforms
     
     @staticmethod
@@ -2247,7 +3350,7 @@ class WaveformSet:
                                             16.,    # TimeStep_ns   ## Hardcoded to 16 ns for now, but
                                                                     ## it must be implemented from the new
                                                                     ## 'metadata' TTree in the ROOT file
-                                            np.array(adcs_address),
+                                            np.array(adcs_address, dtype = np.int16),
                                             0,      #RunNumber      ## To be implemented from the new
                                                                     ## 'metadata' TTree in the ROOT file
                                             record_address[0],
@@ -2275,7 +3378,7 @@ class WaveformSet:
 
                 waveforms.append(Waveform(  timestamp_address[0],
                                             16.,    # TimeStep_ns
-                                            np.array(adcs_address),
+                                            np.array(adcs_address, dtype = np.int16),
                                             0,      #RunNumber      ## To be implemented from the new
                                                                     ## 'metadata' TTree in the ROOT file
                                             record_address[0],
@@ -2703,10 +3806,14 @@ class WaveformSet:
         """
         Parameters
         ----------
-        input : str
-            len(input) must be 5. Such input is interpreted as the
-            concatenation of the endpoint int(input[0:3]) and the 
-            channel int(input[3:5]).
+        input : int
+            It is interpreted as input = (100 * endpoint) + channel,
+            i.e. its last two digits give the channel and the rest
+            of them give the endpoint. For the usual 5-digit inputs
+            (3-digit endpoint, 2-digit channel) this matches the
+            former slicing of the string representation of input.
+            For any other length it does not: p.e. 1203 is now split
+            into (12, 3), whereas slicing gave (120, 3).
 
         Returns
         ----------
@@ -2716,7 +3823,7 @@ class WaveformSet:
             The channel value
         """
 
-        return int(str(input)[0:3]), int(str(input)[3:5])
+        return divmod(int(input), 100)
     
     @staticmethod
     def fraction_is_well_formed(lower_limit : float = 0.0,
@@ -2736,18 +3843,12 @@ class WaveformSet:
         bool
         """
 
-        if lower_limit < 0.0:
-            return False
-        elif upper_limit <= lower_limit:
-            return False
-        elif upper_limit > 1.0:
-            return False
-        
-        return True
+        return 0.0 <= lower_limit < upper_limit <= 1.0
     
     def compute_mean_waveform(self, *args,
                                     wf_idcs : Optional[List[int]] = None,
                                     wf_selector : Optional[Callable[..., bool]] = None,
+                                    out : Optional[np.ndarray] = None,
                                     **kwargs) -> WaveformAdcs:
 
         """
@@ -2797,7 +3898,8 @@ class WaveformSet:
             0 <= i <= len(self.__waveforms) - 1. Any
             integer which does not satisfy this condition
             is ignored. These integers give the waveforms
-            which are averaged.
+            which are averaged. Repeated integers are only
+            taken into account once.
         wf_selector : callable 
             This parameter only makes a difference if 
             the 'wf_idcs' parameter is None. If that's 
@@ -2809,7 +3911,28 @@ class WaveformSet:
             boolean. In this case, the mean waveform 
             is averaged over those waveforms, wf, for 
             which wf_selector(wf, *args, **kwargs) 
-            evaluates to True.
+            evaluates to True. If a numba-compiled 
+            counterpart of wf_selector was registered 
+            via WaveformSet.register_njit_filter() and
+            no keyword arguments are given, then such
+            counterpart is evaluated instead.
+        out : unidimensional numpy array
+            If it is not None, then it must be a floating-
+            point numpy array of length self.PointsPerWf. 
+            In this case, the mean is written into it, 
+            and it is used as the Adcs attribute of the 
+            returned WaveformAdcs object. The sum is also
+            accumulated in the data type of out, so that, 
+            p.e. giving a np.float32 buffer halves the 
+            memory traffic of the accumulator with respect
+            to the default np.float64 one, at the cost of
+            precision. This is useful 
+            to avoid allocating a new array in every call 
+            when this method is called repeatedly. Note 
+            that, in this case, a later call which is given 
+            the same buffer overwrites the Adcs of the 
+            WaveformAdcs object returned by a former call.
+            If it is None, then a new array is allocated.
         *kwargs
             These keyword arguments only make a 
             difference if the 'wf_idcs' parameter is 
@@ -2829,187 +3952,232 @@ class WaveformSet:
             raise Exception(generate_exception_message( 1,
                                                         'WaveformSet.compute_mean_waveform()',
                                                         'There are no waveforms in this WaveformSet object.'))
+        if out is not None:
+            if not isinstance(out, np.ndarray) or out.shape != (self.PointsPerWf,) or not np.issubdtype(out.dtype, np.floating):
+                raise Exception(generate_exception_message( 4,
+                                                            'WaveformSet.compute_mean_waveform()',
+                                                            f"The given out buffer must be a unidimensional floating-point numpy array of length {self.PointsPerWf}."))
         if wf_idcs is None and wf_selector is None:
 
-            output = self.__compute_mean_waveform_of_every_waveform()   # Average over every 
-                                                                        # waveform in this WaveformSet
-        elif wf_idcs is None and wf_selector is not None:
+            idcs = None     # Average over every waveform in this WaveformSet
 
-            signature = inspect.signature(wf_selector)
+        elif wf_idcs is None and wf_selector is not None:
 
-            WaveformSet.check_well_formedness_of_generic_waveform_function(signature)
+            WaveformSet.__check_wf_filter(wf_selector)     # Memoized per selector
 
-            output = self.__compute_mean_waveform_with_selector(wf_selector,
-                                                                *args,
-                                                                **kwargs)
+            idcs = self.__get_idcs_passing_selector(wf_selector,
+                                                    *args,
+                                                    **kwargs)
+            if idcs.size == 0:
+                raise Exception(generate_exception_message( 3,
+                                                            'WaveformSet.compute_mean_waveform()',
+                                                            'No waveform in this WaveformSet object passed the given selector.'))
         else:
 
-            fWfIdcsIsWellFormed = False
-            for idx in wf_idcs:
-                if self.is_valid_iterator_value(idx):
+            idcs = np.asarray(wf_idcs, dtype = np.int64)
+            idcs = np.unique(idcs[(idcs >= 0) & (idcs < len(self.__waveforms))])   # Keep the valid iterator values only, 
+                                                                                    # and count each waveform only once
 
-                    fWfIdcsIsWellFormed = True
-                    break                       # Just make sure that there 
-                                                # is at least one valid 
-                                                # iterator value in the given list
-
-            if not fWfIdcsIsWellFormed:
+            if idcs.size == 0:
                 raise Exception(generate_exception_message( 2,
                                                             'WaveformSet.compute_mean_waveform()',
                                                             'The given list of waveform indices is empty or it does not contain even one valid iterator value in the given list. I.e. there are no waveforms to average.'))
 
-            output = self.__compute_mean_waveform_of_given_waveforms(wf_idcs)   ## In this case we also need to remove indices
-                                                                                ## redundancy (if any) before giving wf_idcs to
-                                                                                ## WaveformSet.__compute_mean_waveform_of_given_waveforms.
-                                                                                ## This is a open issue for now.
-        return output
+        return self.__compute_mean_waveform_of(idcs, out = out)
     
-    def __compute_mean_waveform_of_every_waveform(self) -> WaveformAdcs:
+    def __get_idcs_passing_selector(self,   wf_selector : Callable[..., bool],
+                                            *args,
+                                            **kwargs) -> np.ndarray:
         
         """
         This method should only be called by the
         WaveformSet.compute_mean_waveform() method,
         where any necessary well-formedness checks 
-        have already been performed. It is called by 
-        such method in the case where both the 'wf_idcs' 
-        and the 'wf_selector' input parameters are 
-        None. This method sets the self.__mean_adcs
-        and self.__mean_adcs_idcs attributes according
-        to the WaveformSet.compute_mean_waveform()
-        method documentation. It also returns the 
-        averaged WaveformAdcs object. Refer to the 
-        WaveformSet.compute_mean_waveform() method 
-        documentation for more information.
+        have already been performed. It returns the
+        increasingly-ordered iterator values of the 
+        waveforms, wf, in this WaveformSet for which
+        wf_selector(wf, *args, **kwargs) evaluates to 
+        True. If a numba-compiled counterpart of 
+        wf_selector was registered via 
+        WaveformSet.register_njit_filter() and no
+        keyword arguments are given, then such 
+        counterpart is evaluated over the per-waveform
+        columns instead.
+
+        Parameters
+        ----------
+        wf_selector : callable
+        *args
+        **kwargs
 
         Returns
         ----------
-        output : np.ndarray
-            The averaged adcs array
+        output : unidimensional numpy array of int
         """
 
-        aux = self.Waveforms[0].Adcs                # WaveformSet.compute_mean_waveform() 
-                                                    # has already checked that there is at 
-                                                    # least one waveform in this WaveformSet
-        for i in range(1, len(self.__waveforms)):
-            aux += self.Waveforms[i].Adcs
+        njit_selector = WaveformSet.__njit_filters.get(wf_selector) if not kwargs else None
 
-        output = WaveformAdcs(  self.__waveforms[0].TimeStep_ns,
-                                aux/len(self.__waveforms),
-                                time_offset = 0)
-        
-        self.__mean_adcs = output
-        self.__mean_adcs_idcs = tuple(range(len(self.__waveforms)))
+        if njit_selector is not None:   # Evaluate the registered numba-compiled counterpart over the columns at once
 
-        return output
+            mask = njit_selector(   self.__runs_per_wf,
+                                    self.__endpoints,
+                                    self.__channels,
+                                    self.__timestamps,
+                                    *args)
+        else:
+            mask = np.fromiter( (wf_selector(wf, *args, **kwargs) for wf in self.__waveforms),
+                                dtype = bool,
+                                count = len(self.__waveforms))
+        
+        return np.flatnonzero(mask)     # An index array gathers the selected rows faster than a Python list, and it
+                                        # beats np.add.reduce(..., where = mask), which always reads the whole matrix
     
-    def __compute_mean_waveform_with_selector(self, wf_selector : Callable[..., bool],
-                                                    *args,
-                                                    **kwargs) -> WaveformAdcs:
+    def __compute_mean_waveform_of(self,    idcs : Optional[np.ndarray],
+                                            out : Optional[np.ndarray] = None) -> WaveformAdcs:
         
         """
         This method should only be called by the
         WaveformSet.compute_mean_waveform() method,
         where any necessary well-formedness checks 
-        have already been performed. It is called by 
-        such method in the case where the 'wf_idcs'
-        parameter is None and the 'wf_selector' 
-        parameter is suitably defined. This method 
-        sets the self.__mean_adcs and 
+        have already been performed. It averages the 
+        waveforms whose iterator values are given in
+        idcs, or every waveform in this WaveformSet if
+        idcs is None, regardless of how they were picked
+        (see WaveformSet.compute_mean_waveform()). This 
+        method sets the self.__mean_adcs and 
         self.__mean_adcs_idcs attributes according
         to the WaveformSet.compute_mean_waveform()
         method documentation. It also returns the 
-        averaged WaveformAdcs object. Refer to the 
-        WaveformSet.compute_mean_waveform() method 
-        documentation for more information.
+        averaged WaveformAdcs object. 
 
         Parameters
         ----------
-        wf_selector : callable
-        *args
-        **kwargs
+        idcs : unidimensional numpy array of int
+            If it is not None, then it must contain, at 
+            least, one iterator value. Its iterator values
+            must be valid, non-repeated and increasingly 
+            ordered.
+        out : np.ndarray
 
         Returns
         ----------
-        output : np.ndarray
-            The averaged adcs array
+        output : WaveformAdcs
+            The averaged waveform
         """
 
-        added_wvfs = []
+        self.__mean_adcs = WaveformAdcs(self.__waveforms[0 if idcs is None else idcs[0]].TimeStep_ns,
+                                        WaveformSet.__get_mean_of_rows( self.__adcs_matrix,
+                                                                        idcs = idcs,
+                                                                        out = out),
+                                        time_offset = 0)
+        self.__mean_adcs_idcs = tuple(range(len(self.__waveforms))) if idcs is None else tuple(idcs.tolist())
 
-        aux = np.zeros((self.__points_per_wf,))
-
-        for i in range(len(self.__waveforms)):
-            if wf_selector(self.__waveforms[i], *args, **kwargs):
-                aux += self.__waveforms[i].Adcs
-                added_wvfs.append(i)
-                
-        if len(added_wvfs) == 0:
-            raise Exception(generate_exception_message( 1,
-                                                        'WaveformSet.__compute_mean_waveform_with_selector()',
-                                                        'No waveform in this WaveformSet object passed the given selector.'))
-    
-        output = WaveformAdcs(  self.__waveforms[added_wvfs[0]].TimeStep_ns,
-                                aux/len(added_wvfs),
-                                time_offset = 0)
-        
-        self.__mean_adcs = output
-        self.__mean_adcs_idcs = tuple(added_wvfs)
+        return self.__mean_adcs
 
-        return output
-    
-    def __compute_mean_waveform_of_given_waveforms(self, wf_idcs : List[int]) -> WaveformAdcs:
+    @staticmethod
+    def __get_mean_of_rows( adcs : np.ndarray,
+                            idcs : Optional[np.ndarray] = None,
+                            out : Optional[np.ndarray] = None) -> np.ndarray:
         
         """
-        This method should only be called by the
-        WaveformSet.compute_mean_waveform() method,
-        where any necessary well-formedness checks 
-        have already been performed. It is called by 
-        such method in the case where the 'wf_idcs'
-        parameter is not None, regardless the input
-        given to the 'wf_selector' parameter. This 
-        method sets the self.__mean_adcs and 
-        self.__mean_adcs_idcs attributes according
-        to the WaveformSet.compute_mean_waveform()
-        method documentation. It also returns the 
-        averaged WaveformAdcs object. Refer to the 
-        WaveformSet.compute_mean_waveform() method 
-        documentation for more information.
+        This method is not intended for user usage. It
+        returns the mean of the rows of the given 
+        bidimensional array whose indices are given in
+        idcs, or of every row if idcs is None. At least 
+        one row must be averaged. For integer arrays, p.e. 
+        the int16 ADCs read from ROOT files, the sum is 
+        computed exactly in int64, which is not slower than
+        a floating-point sum, and only the final division 
+        rounds. Otherwise, the sum is accumulated in 
+        np.float64, or in the data type of out, if it is 
+        given. If idcs is given, and it selects, at least, 
+        WaveformSet.__min_rows_per_kernel rows, then the 
+        selected rows are summed in place by 
+        WaveformSet.__add_rows_in_parallel(), instead of 
+        gathering them into a new array first.
 
         Parameters
         ----------
-        wf_idcs : list of int
+        adcs : bidimensional numpy array
+        idcs : unidimensional numpy array of int
+            The indices of the rows to average. They must 
+            be valid, non-repeated indices of adcs.
+        out : unidimensional numpy array
+            If it is not None, then the mean is written
+            into it
 
         Returns
         ----------
-        output : np.ndarray
-            The averaged adcs array
+        output : unidimensional numpy array
         """
 
-        added_wvfs = []
-
-        aux = np.zeros((self.__points_per_wf,))
+        if np.issubdtype(adcs.dtype, np.integer) and (out is None or out.dtype == np.float64):
+            sum_dtype = np.int64
+        else:
+            sum_dtype = np.float64 if out is None else out.dtype
+
+        if idcs is None or len(idcs) == adcs.shape[0]:     # Since idcs has no repeated indices, the second condition means that
+                                                            # every row is averaged, p.e. for a selector which every waveform passes.
+            return np.divide(   np.add.reduce(  adcs,       # Then the whole matrix is reduced as is, with no index indirection.
+                                                axis = 0,
+                                                dtype = sum_dtype),
+                                adcs.shape[0],
+                                out = out)
+        
+        if len(idcs) < WaveformSet.__min_rows_per_kernel:
+            return np.divide(   np.add.reduce(  adcs[idcs],
+                                                axis = 0,
+                                                dtype = sum_dtype),
+                                len(idcs),
+                                out = out)
+
+        partial_sums = np.zeros((min(numba.get_num_threads(), len(idcs)), adcs.shape[1]),     # One row per thread, so
+                                dtype = sum_dtype)                                          # that they do not race
+        WaveformSet.__add_rows_in_parallel( adcs,
+                                            idcs,
+                                            partial_sums)
+        return np.divide(   np.add.reduce(  partial_sums,
+                                            axis = 0),
+                            len(idcs),
+                            out = out)
+    
+    @staticmethod
+    @numba.njit(nogil=True, parallel=True, cache=True)
+    def __add_rows_in_parallel( adcs : np.ndarray,
+                                idcs : np.ndarray,
+                                partial_sums : np.ndarray) -> None:
+        
+        """
+        This method is not intended for user usage. It
+        must only be called by WaveformSet.__get_mean_of_rows().
+        It is the numba-compiled kernel which splits idcs 
+        into as many contiguous chunks as rows in 
+        partial_sums, and adds the rows of adcs whose 
+        indices belong to the i-th chunk to the i-th row 
+        of partial_sums. The chunks are distributed among
+        threads.
 
-        for idx in wf_idcs:
-            try:                # WaveformSet.compute_mean_waveform() only checked that there 
-                                # is at least one valid iterator value, but we need to handle
-                                # the case where there are invalid iterator values
+        Parameters
+        ----------
+        adcs : bidimensional numpy array
+        idcs : unidimensional numpy array of int
+        partial_sums : bidimensional numpy array
+            It must have as many columns as adcs, and 
+            it must be initialized to zero.
 
-                aux += self.__waveforms[idx].Adcs
-            except IndexError:
-                continue        # Ignore the invalid iterator values as specified in the 
-                                # WaveformSet.compute_mean_waveform() method documentation
-            else:
-                added_wvfs.append(idx)
+        Returns
+        ----------
+        None
+        """
 
-        output = WaveformAdcs(  self.__waveforms[added_wvfs[0]].TimeStep_ns,
-                                aux/len(added_wvfs),                            # len(added_wvfs) must be at least 1. 
-                                                                                # This was already checked by 
-                                                                                # WaveformSet.compute_mean_waveform()
-                                time_offset = 0)
-        self.__mean_adcs = output
-        self.__mean_adcs_idcs = tuple(added_wvfs)
+        chunks_no = partial_sums.shape[0]
 
-        return output
+        for i in numba.prange(chunks_no):
+            for k in range((i * len(idcs)) // chunks_no, ((i + 1) * len(idcs)) // chunks_no):
+                row = adcs[idcs[k]]
+                for j in range(adcs.shape[1]):
+                    partial_sums[i, j] += row[j]
+        return
 
     def is_valid_iterator_value(self, iterator_value : int) -> bool:
 
@@ -3019,12 +4187,7 @@ class WaveformSet:
         and False if else.
         """
 
-        if iterator_value < 0:
-            return False
-        elif iterator_value <= len(self.__waveforms) - 1:
-            return True
-        else:
-            return False
+        return 0 <= iterator_value < len(self.__waveforms)
         
     def filter(self,    wf_filter : Callable[..., bool],
                         *args,
@@ -3089,23 +4252,32 @@ class WaveformSet:
             True (resp. False).
         """
 
-        signature = inspect.signature(wf_filter)
-
-        WaveformSet.check_well_formedness_of_generic_waveform_function(signature)
+        WaveformSet.__check_wf_filter(wf_filter)
         
         staying_ones, dumped_ones = [], []      # Better fill the two lists during the WaveformSet scan and then return
                                                 # the desired one, rather than filling just the dumped_ones one and
                                                 # then computing its negative in case return_the_staying_ones is True
-        for i in range(len(self.__waveforms)):      
-            if wf_filter(self.__waveforms[i], *args, **kwargs):
+        for i, wf in enumerate(self.__waveforms):   # Iterate the waveforms directly, instead of
+            if wf_filter(wf, *args, **kwargs):      # looking up self.__waveforms[i] in every step
                 staying_ones.append(i)
             else:
                 dumped_ones.append(i)
 
         if actually_filter:
 
-            for idx in reversed(dumped_ones):       # dumped_ones is increasingly ordered, so 
-                del self.Waveforms[idx]             # iterate in reverse order for waveform deletion
+            waveforms = self.__waveforms
+            waveforms[:] = [waveforms[idx] for idx in staying_ones]     # Rebuild the list in place in one pass, 
+                                                                        # instead of deleting the dumped waveforms
+                                                                        # one by one, which shifts the list each time
+
+            staying = np.asarray(staying_ones, dtype = np.intp)
+
+            self.__update_adcs_matrix()
+            self.__set_columns( self.__endpoints[staying],
+                                self.__channels[staying],
+                                self.__runs_per_wf[staying],
+                                self.__record_numbers_per_wf[staying],
+                                self.__timestamps[staying])
 
             self.__update_runs(other_runs = None)                               # If actually_filter, then we need to update 
             self.__update_record_numbers(other_record_numbers = None)           # the self.__runs, self.__record_numbers and 
@@ -3584,11 +4756,16 @@ class WaveformSet:
         time_step   = (ranges[0,1] - ranges[0,0]) / time_bins
         adc_step    = (ranges[1,1] - ranges[1,0]) / adc_bins
         
-        aux_x = np.hstack([np.arange(   0,
-                                        self.PointsPerWf,
-                                        dtype = np.float32) + self.Waveforms[idx].TimeOffset for idx in wf_idcs])
+        waveforms = self.__waveforms    # Bind it once, instead of going through the Waveforms property for each waveform
+
+        time_offsets = np.array([waveforms[idx].TimeOffset for idx in wf_idcs], dtype = np.float32)
+        baselines = np.array([waveforms[idx].Analyses[analysis_label].Result.Baseline for idx in wf_idcs])
 
-        aux_y = np.hstack([self.Waveforms[idx].Adcs - self.Waveforms[idx].Analyses[analysis_label].Result.Baseline for idx in wf_idcs])
+        aux_x = (np.arange( 0,                                      # Broadcast over the rows of the ADCs matrix,
+                            self.PointsPerWf,                       # instead of concatenating one array per waveform.
+                            dtype = np.float32) + time_offsets[:, np.newaxis]).ravel()  # Row-major order matches
+                                                                                        # the former concatenation
+        aux_y = (self.__adcs_matrix[wf_idcs] - baselines[:, np.newaxis]).ravel()
 
         aux = WaveformSet.histogram2d(  np.vstack((aux_x, aux_y)), 
                                         np.array((time_bins, adc_bins)),
@@ -3782,6 +4959,8 @@ class WaveformSet:
                                                                             # parameter is None.
 
         step = (domain[1] - domain[0]) / bins
+
+        waveforms = self.__waveforms    # Bind it once, instead of going through the Waveforms property for each waveform
                                                                         
         for i in range(nrows):
             for j in range(ncols):
@@ -3791,7 +4970,7 @@ class WaveformSet:
                     if detailed_label:
                          aux_name += f": [{WaveformSet.get_string_of_first_n_integers_if_available(grid_of_wf_idcs_[i][j], queried_no = 2)}]"
                          
-                    data, _ = WaveformSet.histogram1d(  np.array([self.Waveforms[idc].get_analysis(analysis_label).Result.Integral for idc in grid_of_wf_idcs_[i][j]]), ## Trying to grab the WfAna object
+                    data, _ = WaveformSet.histogram1d(  np.array([waveforms[idc].get_analysis(analysis_label).Result.Integral for idc in grid_of_wf_idcs_[i][j]]),     ## Trying to grab the WfAna object
                                                         bins,                                                                                                           ## waveform by waveform using 
                                                         domain,                                                                                                         ## WaveformAdcs.get_analysis()
                                                         keep_track_of_idcs = False)                                                                                     ## might be slow. Find a different
@@ -3910,9 +5089,16 @@ class WaveformSet:
         for wf in other.Waveforms:
             self.__waveforms.append(wf)
 
+        self.__update_adcs_matrix()
+        self.__set_columns( np.concatenate((self.__endpoints, other.__endpoints)),
+                            np.concatenate((self.__channels, other.__channels)),
+                            np.concatenate((self.__runs_per_wf, other.__runs_per_wf)),
+                            np.concatenate((self.__record_numbers_per_wf, other.__record_numbers_per_wf)),
+                            np.concatenate((self.__timestamps, other.__timestamps)))
+
         self.__update_runs(other_runs = other.Runs)
         self.__update_record_numbers(other_record_numbers = other.RecordNumbers)
-        self.__update_available_channels(other_available_channels = other.AvailableChannels)
+        self.__update_available_channels(other_available_channels = other.AvailableChannels if self.__available_channels is not None else None)
 
         self.__mean_adcs = None
         self.__mean_adcs_idcs = None
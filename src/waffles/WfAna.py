@@ -1,5 +1,9 @@
-from typing import Tuple, List, TYPE_CHECKING
+import os
+import inspect
+import functools
+from typing import Tuple, List, Callable, TYPE_CHECKING
 from scipy import signal as spsi
+import numba
 import numpy as np
 
 if TYPE_CHECKING:                                # Import only for type-checking, so as
@@ -7,6 +11,39 @@ if TYPE_CHECKING:                                # Import only for type-checking
                                                     
 from .WfAnaResult import WfAnaResult
 from .WfPeak import WfPeak
+from .Exceptions import generate_exception_message
+
+try:                                # JAX is an optional dependency, which is only
+    import jax                      # needed for the 'jax' batch-analysis backend
+    import jax.numpy as jnp         # (see WfAna.analyse_batch())
+except ImportError:
+    jax = None
+
+def waveform_analyser(analyser : Callable) -> Callable:
+
+    """
+    Decorator which registers the given WfAna method as
+    an analyser, i.e. as a method which can be run by
+    WaveformAdcs.analyse() and WaveformSet.analyse() 
+    via its name. The registration is a mere flag on 
+    the given function, so that checking whether a 
+    method is an analyser takes a single attribute 
+    lookup. The decorated method must meet the 
+    requirements which are checked by 
+    WfAna.check_analysers().
+
+    Parameters
+    ----------
+    analyser : callable
+
+    Returns
+    ----------
+    analyser : callable
+        The given callable, flagged as an analyser
+    """
+
+    analyser.__is_waveform_analyser__ = True
+    return analyser
 
 class WfAna:
 
@@ -40,6 +77,12 @@ class WfAna:
         filter. True (resp. False) if analysis concluded that 
         the waveform passes (fails).
 
+    ANALYSERS : dict
+        A class attribute whose keys are the names of the
+        methods of this class which are registered as 
+        analysers (see the waveform_analyser decorator), 
+        and whose values are such (unbound) methods.
+
     Methods
     ----------
     ## Add the list of methods and a summary for each one here
@@ -108,6 +151,7 @@ class WfAna:
         self.__passed = input
         return
 
+    @waveform_analyser
     def analyser_template(  self,
                             waveform : 'WaveformAdcs',
                             *args,
@@ -152,6 +196,7 @@ class WfAna:
 
         return output_1, output_2, output_3
     
+    @waveform_analyser
     def standard_analyser(  self,
                             waveform : 'WaveformAdcs',  # The WaveformAdcs class is not defined at runtime, only
                                                         # during type-checking (see TYPE_CHECKING). Not enclosing
@@ -250,6 +295,355 @@ class WfAna:
             output_3 = {}
             
         return output_1, output_2, output_3
+
+    def standard_analyser_batch(self,   adcs_matrix : np.ndarray,
+                                        time_offsets : np.ndarray,
+                                        time_steps_ns : np.ndarray,
+                                        *args,
+                                        **kwargs) -> List[Tuple[WfAnaResult, bool, dict]]:
+
+        """
+        This method is the batched counterpart of the
+        WfAna.standard_analyser() method. Instead of analysing
+        one WaveformAdcs object, it analyses every row of the
+        given ADCs matrix at once, so that the baselines are 
+        computed with a few vectorized numpy operations (see 
+        WfAna.analyse_batch()) instead of one Python call per
+        waveform. The peaks are still searched
+        row by row using scipy.signal.find_peaks. The results
+        match those of WfAna.standard_analyser() when it is run
+        over each row of the matrix. The same well-formedness
+        assumptions stated in the WfAna.standard_analyser()
+        docstring apply here, for each row. No checks are
+        performed here.
+
+        Parameters
+        ----------
+        adcs_matrix : bidimensional numpy array
+            adcs_matrix[i] gives the Adcs of the i-th waveform
+            which will be analysed
+        time_offsets : unidimensional numpy array of integers
+            time_offsets[i] gives the TimeOffset of the i-th
+            waveform which will be analysed
+        time_steps_ns : unidimensional numpy array of floats
+            time_steps_ns[i] gives the TimeStep_ns of the i-th
+            waveform which will be analysed
+        *args
+            These arguments are passed to 
+            scipy.signal.find_peaks() for every row as *args.
+        **kwargs
+            They are interpreted as in WfAna.standard_analyser().
+
+        Returns
+        ----------
+        output : list of tuple of ( WfAnaResult, bool, dict, )
+            output[i] is the output of WfAna.standard_analyser()
+            for the i-th row of the given matrix.
+        """
+
+        return_peaks_properties = kwargs.pop('return_peaks_properties', None)
+
+        baselines, _ = WfAna.analyse_batch( adcs_matrix,
+                                            time_offsets,
+                                            time_steps_ns,
+                                            self.__baseline_limits,
+                                            self.__int_ll,
+                                            self.__int_ul)
+        output = []
+
+        for i in range(adcs_matrix.shape[0]):
+
+            peaks, properties = spsi.find_peaks(-1.*adcs_matrix[i], *args, **kwargs)   ## Assuming that the waveform is inverted,
+                                                                                        ## as in WfAna.standard_analyser()
+            output_1 = WfAnaResult( baseline=baselines[i],
+                                    baseline_min=None,
+                                    baseline_max=None,
+                                    baseline_rms=None,
+                                    peaks= [ WfPeak(peaks[j]) for j in range(len(peaks)) ],
+                                    integral=None,      # As in WfAna.standard_analyser(), which does not set it yet
+                                    deconvoluted_adcs=None)
+
+            output.append(( output_1,
+                            True,
+                            {'peaks_properties': properties} if return_peaks_properties is True else {}))
+        return output
+
+    @staticmethod
+    def analyse_batch(  adcs_matrix : np.ndarray,
+                        time_offsets : np.ndarray,
+                        time_steps_ns : np.ndarray,
+                        baseline_limits : List[int],
+                        int_ll : int,
+                        int_ul : int) -> Tuple[np.ndarray, np.ndarray]:
+
+        """
+        This method computes, for every row of the given ADCs
+        matrix, the baseline and the integral as they are
+        defined in the WfAna.standard_analyser() docstring. 
+        I.e. the baseline is the median of the points given 
+        by baseline_limits, and the integral is computed over
+        the [int_ll, int_ul] window after subtracting such
+        baseline. Both of them take the time offset of each
+        row into account. The backend which performs the 
+        computation is selected via the WAFFLES_BATCH_BACKEND
+        environment variable. If it is not defined, or it
+        is set to 'numba', the computation is delegated to
+        a numba-compiled kernel which processes the rows in
+        parallel and does not allocate any intermediate
+        matrix. If it is set to 'jax', then the ADCs matrix
+        is transferred once to the default JAX device (p.e.
+        a GPU) and a jax.jit-compiled kernel is run there. 
+        Only the reduced baselines and integrals are 
+        transferred back. Note that the JAX backend works 
+        in single precision (float32), so its results may 
+        differ slightly from those of the numba backend. 
+        It is the caller's responsibility to ensure the 
+        well-formedness of the input. No checks are 
+        performed here.
+
+        Parameters
+        ----------
+        adcs_matrix : bidimensional numpy array
+        time_offsets : unidimensional numpy array of integers
+        time_steps_ns : unidimensional numpy array of floats
+        baseline_limits : list of int
+        int_ll (resp. int_ul) : int
+
+        Returns
+        ----------
+        baselines : unidimensional numpy array of floats
+            baselines[i] is the baseline of adcs_matrix[i]
+        integrals : unidimensional numpy array of floats
+            integrals[i] is the integral of adcs_matrix[i]
+        """
+
+        backend = os.environ.get('WAFFLES_BATCH_BACKEND', 'numba')
+
+        if backend == 'jax':
+
+            if jax is None:
+                raise Exception(generate_exception_message( 1,
+                                                            'WfAna.analyse_batch()',
+                                                            "The 'jax' backend was requested via the WAFFLES_BATCH_BACKEND environment variable, but JAX is not installed."))
+            
+            baselines, integrals = WfAna.__get_jax_kernel()(jnp.asarray(adcs_matrix),
+                                                            jnp.asarray(np.concatenate([np.arange(baseline_limits[2*i], baseline_limits[(2*i) + 1]) 
+                                                                                        for i in range(len(baseline_limits)//2)])),
+                                                            jnp.arange(int_ll, int_ul + 1),
+                                                            jnp.asarray(time_offsets),
+                                                            jnp.asarray(time_steps_ns, dtype = jnp.float32))
+            
+            return np.asarray(baselines, dtype = np.float64), np.asarray(integrals, dtype = np.float64)
+        
+        elif backend != 'numba':
+            raise Exception(generate_exception_message( 2,
+                                                        'WfAna.analyse_batch()',
+                                                        f"The batch-analysis backend '{backend}' is not supported. It must be either 'numba' or 'jax'."))
+
+        baselines = np.empty((adcs_matrix.shape[0],), dtype = np.float64)
+        integrals = np.empty((adcs_matrix.shape[0],), dtype = np.float64)
+
+        WfAna.__baseline_and_integral(  adcs_matrix,
+                                        np.asarray(time_offsets, dtype = np.int64),
+                                        np.asarray(time_steps_ns, dtype = np.float64),
+                                        np.asarray(baseline_limits[0::2], dtype = np.int64),
+                                        np.asarray(baseline_limits[1::2], dtype = np.int64),
+                                        int_ll,
+                                        int_ul,
+                                        baselines,
+                                        integrals)
+        
+        return baselines, integrals
+    
+    @staticmethod
+    @numba.njit(nogil=True, parallel=True, cache=True)
+    def __baseline_and_integral(adcs_matrix : np.ndarray,
+                                time_offsets : np.ndarray,
+                                time_steps_ns : np.ndarray,
+                                baseline_starts : np.ndarray,
+                                baseline_ends : np.ndarray,
+                                int_ll : int,
+                                int_ul : int,
+                                baselines : np.ndarray,
+                                integrals : np.ndarray) -> None:
+        
+        """
+        This method is not intended for user usage. It 
+        must only be called by WfAna.analyse_batch(), 
+        which is in charge of providing well-formed inputs.
+        It is the numba-compiled kernel which computes,
+        in a single pass per row, the baseline and the 
+        baseline-subtracted integral of every row of the 
+        given ADCs matrix, and writes them to the given 
+        baselines and integrals arrays, respectively. 
+        The rows are distributed among threads.
+
+        Parameters
+        ----------
+        adcs_matrix : bidimensional numpy array
+        time_offsets : unidimensional numpy array of int64
+        time_steps_ns : unidimensional numpy array of float64
+        baseline_starts (resp. baseline_ends) : unidimensional numpy array of int64
+            The even (resp. odd) entries of the 'baseline_limits'
+            parameter of WfAna.analyse_batch()
+        int_ll (resp. int_ul) : int
+        baselines : unidimensional numpy array of float64
+        integrals : unidimensional numpy array of float64
+            These arrays must have as many entries as rows
+            in adcs_matrix. They are overwritten.
+
+        Returns
+        ----------
+        None
+        """
+
+        baseline_points = 0
+        for j in range(baseline_starts.shape[0]):
+            baseline_points += baseline_ends[j] - baseline_starts[j]
+
+        for i in numba.prange(adcs_matrix.shape[0]):
+
+            offset = time_offsets[i]
+            samples = np.empty(baseline_points, dtype = np.float64)     # Per-row buffer, so that the median
+                                                                        # computation does not need any slicing
+            k = 0
+            for j in range(baseline_starts.shape[0]):
+                for l in range(baseline_starts[j] - offset, baseline_ends[j] - offset):
+                    samples[k] = adcs_matrix[i, l]
+                    k += 1
+
+            baseline = np.median(samples)
+
+            accumulator = 0.
+            for l in range(int_ll - offset, int_ul + 1 - offset):
+                accumulator += adcs_matrix[i, l]
+
+            baselines[i] = baseline
+            integrals[i] = time_steps_ns[i]*(accumulator - (baseline*(int_ul + 1 - int_ll)))
+
+        return
+    
+    @staticmethod
+    def __baseline_and_integral_array_api(  xp,
+                                            adcs_matrix,
+                                            baseline_idcs,
+                                            integration_idcs,
+                                            time_offsets,
+                                            time_steps_ns) -> tuple:
+        
+        """
+        This method is not intended for user usage. It 
+        computes the same baselines and integrals as 
+        WfAna.__baseline_and_integral(), but it is written
+        using whole-array operations of the given array
+        module, xp, so that it can be traced and compiled
+        by JAX (see WfAna.__get_jax_kernel()). The ADCs are 
+        upcasted to float32 before any reduction.
+
+        Parameters
+        ----------
+        xp : module
+            A numpy-like array module, p.e. jax.numpy
+        adcs_matrix : bidimensional array
+        baseline_idcs : unidimensional array of int
+            The iterator values, with a null time offset,
+            of the points which are used for the baseline
+            calculation, i.e. the concatenation of the 
+            ranges given by the baseline limits
+        integration_idcs : unidimensional array of int
+            The iterator values, with a null time offset,
+            of the points within the integration window
+        time_offsets : unidimensional array of int
+        time_steps_ns : unidimensional array of float
+
+        Returns
+        ----------
+        baselines : unidimensional array of float32
+        integrals : unidimensional array of float32
+        """
+
+        adcs = adcs_matrix.astype(xp.float32)
+
+        baselines = xp.median(  xp.take_along_axis( adcs,
+                                                    baseline_idcs[xp.newaxis, :] - time_offsets[:, xp.newaxis],
+                                                    axis = 1),
+                                axis = 1)
+        
+        window_sums = xp.sum(   xp.take_along_axis( adcs,
+                                                    integration_idcs[xp.newaxis, :] - time_offsets[:, xp.newaxis],
+                                                    axis = 1),
+                                axis = 1)
+        
+        return baselines, time_steps_ns*(window_sums - (baselines*integration_idcs.shape[0]))
+    
+    @staticmethod
+    @functools.lru_cache(maxsize = 1)
+    def __get_jax_kernel() -> Callable:
+
+        """
+        This method is not intended for user usage. It 
+        returns the jax.jit-compiled version of 
+        WfAna.__baseline_and_integral_array_api() for 
+        xp = jax.numpy. It is built once, on first use, 
+        so that importing this module does not require JAX.
+
+        Returns
+        ----------
+        kernel : callable
+        """
+
+        return jax.jit(functools.partial(WfAna.__baseline_and_integral_array_api, jnp))
+
+    @classmethod
+    def check_analysers(cls) -> None:
+
+        """
+        This method checks that every WfAna method which 
+        has been registered as an analyser (i.e. decorated
+        with waveform_analyser) is suitable to be used as 
+        such. I.e. its first parameter (apart from self) 
+        must be called 'waveform', it must be hinted as a 
+        WaveformAdcs object (or the 'WaveformAdcs' string
+        literal), and its return annotation must match 
+        Tuple[WfAnaResult, bool, dict]. If any registered 
+        analyser does not meet these requirements, an 
+        exception is raised. This check is not run every
+        time an analysis is performed. It is run once, 
+        when this module is imported, right after the 
+        definition of this class. Call it again if an 
+        analyser is registered afterwards.
+
+        Returns
+        ----------
+        None
+        """
+
+        for name, analyser in cls.ANALYSERS.items():
+
+            signature = inspect.signature(analyser)
+            parameters = [parameter for parameter in signature.parameters.keys() if parameter != 'self']
+
+            if len(parameters) == 0:
+                raise Exception(generate_exception_message( 1,
+                                                            'WfAna.check_analysers()',
+                                                            f"The analyser method '{name}' must take at least one parameter."))
+            if parameters[0] != 'waveform':
+                raise Exception(generate_exception_message( 2,
+                                                            'WfAna.check_analysers()',
+                                                            f"The name of the first parameter of the analyser method '{name}' must be 'waveform'."))
+            
+            annotation = signature.parameters['waveform'].annotation
+
+            if annotation != 'WaveformAdcs' and getattr(annotation, '__name__', None) != 'WaveformAdcs':
+                raise Exception(generate_exception_message( 3,
+                                                            'WfAna.check_analysers()',
+                                                            f"The 'waveform' parameter of the analyser method '{name}' must be hinted as a WaveformAdcs object."))
+            
+            if signature.return_annotation != Tuple[WfAnaResult, bool, dict]:
+                raise Exception(generate_exception_message( 4,
+                                                            'WfAna.check_analysers()',
+                                                            f"The return type of the analyser method '{name}' must be hinted as Tuple[WfAnaResult, bool, dict]."))
+        return
     
     def baseline_is_available(self) -> bool:
         
@@ -287,4 +681,12 @@ class WfAna:
                 if len(self.__result.Peaks) > 0:
                     return True
         
-        return False
\ No newline at end of file
+        return False
+    
+    ANALYSERS = {   name : method                                               # Maps the name of every registered analyser 
+                    for name, method in list(locals().items())                  # to its (unbound) function, so that dispatching
+                    if getattr(method, '__is_waveform_analyser__', False) }     # an analyser by name is a dictionary lookup. It
+                                                                                # must be defined at the end of the class body,
+                                                                                # once every method has been defined.
+
+WfAna.check_analysers()     # Run once per process, so that the analysers need not be inspected on every analysis
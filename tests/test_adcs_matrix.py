@@ -0,0 +1,87 @@
+import numpy as np
+
+from waffles.Waveform import Waveform
+from waffles.WaveformSet import WaveformSet
+
+
+def build_waveforms(n_wfs, points_per_wf = 32, seed = 0):
+
+    rng = np.random.default_rng(seed)
+
+    return [Waveform(   i,
+                        16.,
+                        rng.integers(0, 1000, points_per_wf).astype(np.int16),
+                        i % 2,
+                        i,
+                        100 + i % 3,
+                        i % 4,
+                        time_offset = 0) for i in range(n_wfs)]
+
+def rows_are_views(wfset):
+
+    return all(np.shares_memory(wf.Adcs, wfset.AdcsMatrix[i]) for i, wf in enumerate(wfset.Waveforms))
+
+def test_adcs_matrix_matches_the_stacked_adcs():
+
+    waveforms = build_waveforms(20)
+    expected = np.stack([wf.Adcs.copy() for wf in waveforms])
+
+    wfset = WaveformSet(*waveforms)
+
+    assert np.array_equal(wfset.AdcsMatrix, expected)
+    assert rows_are_views(wfset)
+
+def test_adopted_matrix_matches_the_stacked_adcs():
+
+    adcs = np.random.default_rng(1).integers(0, 1000, (20, 32)).astype(np.int16)
+
+    wfset = WaveformSet.from_arrays(np.arange(20),
+                                    adcs,
+                                    np.arange(20),
+                                    np.full(20, 100),
+                                    np.arange(20) % 4)
+
+    assert np.shares_memory(wfset.AdcsMatrix, adcs)
+    assert np.array_equal(np.stack([wf.Adcs for wf in wfset.Waveforms]), adcs)
+    assert rows_are_views(wfset)
+
+def test_waveforms_of_another_set_are_not_rebound():
+
+    wfset = WaveformSet(*build_waveforms(20))
+    matrix = wfset.AdcsMatrix
+
+    subset = WaveformSet(*wfset.Waveforms[::2])         # Its waveforms are backed by the matrix of wfset,
+                                                        # so the subset must copy, not adopt, their rows
+    assert not np.shares_memory(subset.AdcsMatrix, matrix)
+    assert np.array_equal(subset.AdcsMatrix, matrix[::2])
+    assert rows_are_views(wfset)
+
+    wfset_from_arrays = WaveformSet.from_arrays(np.arange(20),
+                                                matrix,
+                                                np.arange(20),
+                                                np.full(20, 100),
+                                                np.arange(20) % 4)
+
+    assert not np.shares_memory(wfset_from_arrays.AdcsMatrix, matrix)
+    assert rows_are_views(wfset)
+
+def test_filter_and_merge_keep_the_matrix_in_sync():
+
+    wfset = WaveformSet(*build_waveforms(20))
+
+    def match_channel_1(waveform : Waveform) -> bool:
+        return waveform.Channel == 1
+
+    wfset.filter(match_channel_1, actually_filter = True)
+
+    assert all(wf.Channel == 1 for wf in wfset.Waveforms)
+    assert np.array_equal(wfset.AdcsMatrix, np.stack([wf.Adcs for wf in wfset.Waveforms]))
+    assert rows_are_views(wfset)
+
+    other = WaveformSet(*build_waveforms(3, seed = 2))
+    wfset.merge(other)
+
+    assert len(wfset.Waveforms) == 8
+    assert np.array_equal(wfset.AdcsMatrix, np.stack([wf.Adcs for wf in wfset.Waveforms]))
+    assert all(np.shares_memory(wf.Adcs, wfset.AdcsMatrix[i]) for i, wf in enumerate(wfset.Waveforms[:5]))
+    assert rows_are_views(other)    # The merged waveforms are still owned by other
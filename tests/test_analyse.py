@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from waffles.Waveform import Waveform
+from waffles.WaveformSet import WaveformSet
+
+
+def build_wfset(n_wfs, points_per_wf = 64, seed = 0):
+
+    rng = np.random.default_rng(seed)
+
+    return WaveformSet(*[Waveform(  i,
+                                    16.,
+                                    (1000 + rng.integers(-50, 50, points_per_wf)).astype(np.int16),
+                                    0,
+                                    i,
+                                    100,
+                                    1,
+                                    time_offset = i % 3) for i in range(n_wfs)])
+
+def assert_same_analyses(wfset, label, reference_label):
+
+    for wf in wfset.Waveforms:
+
+        result = wf.Analyses[label].Result
+        reference = wf.Analyses[reference_label].Result
+
+        assert np.isclose(result.Baseline, reference.Baseline)
+        assert result.Integral is None and reference.Integral is None     # Not computed by WfAna.standard_analyser() yet
+        assert [peak.Position for peak in result.Peaks] == [peak.Position for peak in reference.Peaks]
+        assert wf.Analyses[label].Passed == wf.Analyses[reference_label].Passed
+
+@pytest.mark.parametrize('baseline_limits', [[5, 10], [5, 10, 20, 25]])
+def test_batch_analysis_matches_the_per_waveform_one(monkeypatch, baseline_limits):
+
+    wfset = build_wfset(50)
+
+    monkeypatch.setattr(WaveformSet, '_WaveformSet__min_wfs_per_batch', len(wfset.Waveforms) + 1)
+    wfset.analyse(  'per_waveform',
+                    'standard_analyser',
+                    baseline_limits,
+                    int_ll = 30,
+                    int_ul = 40,
+                    height = 30)
+
+    monkeypatch.setattr(WaveformSet, '_WaveformSet__min_wfs_per_batch', 0)
+    output = wfset.analyse( 'batch',
+                            'standard_analyser',
+                            baseline_limits,
+                            int_ll = 30,
+                            int_ul = 40,
+                            height = 30)
+
+    assert sorted(output.keys()) == list(range(len(wfset.Waveforms)))
+    assert_same_analyses(wfset, 'batch', 'per_waveform')
+
+def test_pool_analysis_matches_the_sequential_one(monkeypatch):
+
+    wfset = build_wfset(2 * 256 + 10, seed = 1)    # Enough waveforms for WaveformSet.analyse() to use 2 processes
+
+    monkeypatch.setattr(WaveformSet, '_WaveformSet__min_wfs_per_batch', len(wfset.Waveforms) + 1)
+    sequential_output = wfset.analyse(  'sequential',
+                                        'standard_analyser',
+                                        [5, 10],
+                                        int_ll = 30,
+                                        int_ul = 40,
+                                        n_processes = 1,
+                                        height = 30)
+    
+    pool_output = wfset.analyse('pool',
+                                'standard_analyser',
+                                [5, 10],
+                                int_ll = 30,
+                                int_ul = 40,
+                                n_processes = 2,
+                                height = 30)
+
+    assert sorted(pool_output.keys()) == sorted(sequential_output.keys())
+    assert_same_analyses(wfset, 'pool', 'sequential')
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from waffles.WaveformAdcs import WaveformAdcs
+from waffles.WfAna import WfAna
+
+
+BASELINE_LIMITS = [2, 8, 20, 26]
+INT_LL, INT_UL = 30, 40
+
+def build_inputs(n_wfs = 40, points_per_wf = 64, seed = 0):
+
+    rng = np.random.default_rng(seed)
+
+    adcs_matrix = (1000 + rng.integers(-50, 50, (n_wfs, points_per_wf))).astype(np.int16)
+    time_offsets = np.arange(n_wfs, dtype = np.int64) % 3
+    time_steps_ns = np.full((n_wfs,), 16., dtype = np.float64)
+
+    return adcs_matrix, time_offsets, time_steps_ns
+
+def reference_baselines_and_integrals(adcs_matrix, time_offsets, time_steps_ns):
+
+    """
+    Per-waveform reference: the baseline is the one computed
+    by WfAna.standard_analyser(), and the integral follows
+    the formula in its docstring
+    """
+
+    baselines, integrals = [], []
+
+    for adcs, time_offset, time_step_ns in zip(adcs_matrix, time_offsets, time_steps_ns):
+
+        result, _, _ = WfAna(   BASELINE_LIMITS,
+                                INT_LL,
+                                INT_UL).standard_analyser(WaveformAdcs( time_step_ns,
+                                                                        adcs,
+                                                                        time_offset = int(time_offset)))
+        baselines.append(result.Baseline)
+        integrals.append(time_step_ns*np.sum(-result.Baseline + adcs[INT_LL - time_offset : INT_UL + 1 - time_offset]))
+
+    return np.array(baselines), np.array(integrals)
+
+def test_numba_backend_matches_the_per_waveform_reference(monkeypatch):
+
+    monkeypatch.delenv('WAFFLES_BATCH_BACKEND', raising = False)
+
+    inputs = build_inputs()
+    baselines, integrals = WfAna.analyse_batch(*inputs, BASELINE_LIMITS, INT_LL, INT_UL)
+    reference_baselines, reference_integrals = reference_baselines_and_integrals(*inputs)
+
+    assert np.allclose(baselines, reference_baselines)
+    assert np.allclose(integrals, reference_integrals)
+
+def test_numba_backend_matches_a_hand_computed_value(monkeypatch):
+
+    monkeypatch.delenv('WAFFLES_BATCH_BACKEND', raising = False)
+
+    adcs_matrix = np.array([[10, 12, 11, 20, 30, 5]], dtype = np.int16)
+
+    baselines, integrals = WfAna.analyse_batch( adcs_matrix,
+                                                np.array([0]),
+                                                np.array([2.]),
+                                                [0, 3],     # Median of 10, 12 and 11
+                                                3,
+                                                5)
+
+    assert baselines[0] == 11.
+    assert integrals[0] == 2.*((20 - 11) + (30 - 11) + (5 - 11))
+
+def test_array_api_kernel_matches_the_numba_backend(monkeypatch):
+
+    monkeypatch.delenv('WAFFLES_BATCH_BACKEND', raising = False)
+
+    adcs_matrix, time_offsets, time_steps_ns = build_inputs()
+    baselines, integrals = WfAna.analyse_batch( adcs_matrix,
+                                                time_offsets,
+                                                time_steps_ns,
+                                                BASELINE_LIMITS,
+                                                INT_LL,
+                                                INT_UL)
+
+    xp_baselines, xp_integrals = WfAna._WfAna__baseline_and_integral_array_api( np,     # The kernel which JAX traces,
+                                                                                        # run with numpy instead
+                                                                                adcs_matrix,
+                                                                                np.concatenate([np.arange(BASELINE_LIMITS[i], BASELINE_LIMITS[i + 1]) for i in range(0, len(BASELINE_LIMITS), 2)]),
+                                                                                np.arange(INT_LL, INT_UL + 1),
+                                                                                time_offsets,
+                                                                                time_steps_ns.astype(np.float32))
+    assert np.allclose(xp_baselines, baselines)
+    assert np.allclose(xp_integrals, integrals, rtol = 1e-5)
+
+def test_jax_backend_matches_the_numba_backend(monkeypatch):
+
+    pytest.importorskip('jax')
+
+    inputs = build_inputs()
+
+    monkeypatch.delenv('WAFFLES_BATCH_BACKEND', raising = False)
+    baselines, integrals = WfAna.analyse_batch(*inputs, BASELINE_LIMITS, INT_LL, INT_UL)
+
+    monkeypatch.setenv('WAFFLES_BATCH_BACKEND', 'jax')
+    jax_baselines, jax_integrals = WfAna.analyse_batch(*inputs, BASELINE_LIMITS, INT_LL, INT_UL)
+
+    assert np.allclose(jax_baselines, baselines)
+    assert np.allclose(jax_integrals, integrals, rtol = 1e-5)
+
+def test_unknown_backend_raises(monkeypatch):
+
+    monkeypatch.setenv('WAFFLES_BATCH_BACKEND', 'cupy')
+
+    with pytest.raises(Exception):
+        WfAna.analyse_batch(*build_inputs(), BASELINE_LIMITS, INT_LL, INT_UL)
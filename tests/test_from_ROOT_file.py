@@ -0,0 +1,101 @@
+import awkward as ak
+import numpy as np
+import pytest
+import uproot
+
+from waffles.WaveformSet import WaveformSet
+
+
+N_WFS = 300
+
+def write_ROOT_file(filepath, lengths):
+
+    rng = np.random.default_rng(0)
+
+    branches = {'adcs' : ak.Array([(1000 + rng.integers(-500, 500, length)).astype(np.int16) for length in lengths]),
+                'channel' : np.array([10100 + i % 7 if i % 2 else 11245 for i in range(N_WFS)], dtype = np.int16),
+                'timestamp' : np.arange(N_WFS, dtype = np.uint64) * 100 + 50,
+                'record' : np.arange(N_WFS, dtype = np.int32),
+                'is_fullstream' : np.array([i % 5 != 0 for i in range(N_WFS)]),
+                'daq_timestamp' : np.arange(N_WFS, dtype = np.uint64) * 100 + 40 + np.arange(N_WFS, dtype = np.uint64) % 3}
+
+    with uproot.recreate(filepath) as file:
+        tree = file.mktree('raw_waveforms', {name : (branch.type if name == 'adcs' else branch.dtype) for name, branch in branches.items()})
+        tree.extend(branches)
+
+    return branches
+
+def read_per_waveform(branches, read_full_streaming_data, set_offset_wrt_daq_window, start):
+
+    """
+    Reference reading, one waveform at a time
+    """
+
+    idcs = [i for i in range(start, N_WFS) if bool(branches['is_fullstream'][i]) == read_full_streaming_data]
+    offsets = [int(branches['timestamp'][i]) - int(branches['daq_timestamp'][i]) for i in idcs]
+
+    if set_offset_wrt_daq_window:
+        offsets = [offset - min(offsets) for offset in offsets]
+    else:
+        offsets = [0] * len(idcs)
+
+    return [(   int(branches['timestamp'][i]),
+                int(branches['record'][i]),
+                int(branches['channel'][i]) // 100,
+                int(branches['channel'][i]) % 100,
+                offset,
+                np.asarray(branches['adcs'][i]).tolist()) for i, offset in zip(idcs, offsets)]
+
+def as_tuples(wfset):
+
+    return [(   int(wf.Timestamp),
+                int(wf.RecordNumber),
+                wf.Endpoint,
+                wf.Channel,
+                int(wf.TimeOffset),
+                wf.Adcs.tolist()) for wf in wfset.Waveforms]
+
+@pytest.mark.parametrize('set_offset_wrt_daq_window', [False, True])
+@pytest.mark.parametrize('read_full_streaming_data', [False, True])
+def test_uproot_reader_matches_the_per_waveform_reading(tmp_path,
+                                                        read_full_streaming_data,
+                                                        set_offset_wrt_daq_window):
+    filepath = str(tmp_path / 'waveforms.root')
+    branches = write_ROOT_file(filepath, [32] * N_WFS)
+
+    wfset = WaveformSet.from_ROOT_file( filepath,
+                                        library = 'uproot',
+                                        read_full_streaming_data = read_full_streaming_data,
+                                        set_offset_wrt_daq_window = set_offset_wrt_daq_window,
+                                        start_fraction = 0.1,
+                                        verbose = False)
+
+    assert as_tuples(wfset) == read_per_waveform(   branches,
+                                                    read_full_streaming_data,
+                                                    set_offset_wrt_daq_window,
+                                                    start = 30)
+    assert wfset.AdcsMatrix.dtype == np.int16
+    assert all(np.shares_memory(wf.Adcs, wfset.AdcsMatrix) for wf in wfset.Waveforms)
+
+def test_uproot_reader_truncates_non_homogeneous_waveforms(tmp_path):
+
+    filepath = str(tmp_path / 'waveforms.root')
+    branches = write_ROOT_file(filepath, [32 + i % 4 for i in range(N_WFS)])
+
+    with pytest.raises(Exception):
+        WaveformSet.from_ROOT_file( filepath,
+                                    library = 'uproot',
+                                    verbose = False)
+
+    wfset = WaveformSet.from_ROOT_file( filepath,
+                                        library = 'uproot',
+                                        truncate_wfs_to_minimum = True,
+                                        verbose = False)
+
+    expected = read_per_waveform(   branches,
+                                    False,
+                                    False,
+                                    start = 0)
+
+    assert wfset.PointsPerWf == 32
+    assert as_tuples(wfset) == [wf[:5] + (wf[5][:32],) for wf in expected]
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from waffles.Waveform import Waveform
+from waffles.WaveformSet import WaveformSet
+
+
+def build_wfset(n_wfs = 200, points_per_wf = 64, seed = 0):
+
+    rng = np.random.default_rng(seed)
+
+    return WaveformSet(*[Waveform(  i,
+                                    16.,
+                                    rng.integers(-8000, 8000, points_per_wf).astype(np.int16),
+                                    0,
+                                    i,
+                                    100,
+                                    i % 7,
+                                    time_offset = 0) for i in range(n_wfs)])
+
+def per_waveform_mean(wfset, idcs):
+
+    return np.mean(np.stack([wfset.Waveforms[i].Adcs.astype(np.float64) for i in idcs]), axis = 0)
+
+def match_channel(waveform : Waveform, channel : int) -> bool:  # Unregistered counterpart of WaveformSet.match_channel()
+    return waveform.Channel == channel
+
+def test_mean_of_every_waveform():
+
+    wfset = build_wfset()
+
+    assert np.allclose( wfset.compute_mean_waveform().Adcs,
+                        per_waveform_mean(wfset, range(len(wfset.Waveforms))))
+
+@pytest.mark.parametrize('min_rows_per_kernel', [0, 10000])
+def test_mean_of_the_given_indices(monkeypatch, min_rows_per_kernel):
+
+    monkeypatch.setattr(WaveformSet, '_WaveformSet__min_rows_per_kernel', min_rows_per_kernel)
+
+    wfset = build_wfset()
+    wf_idcs = [150, 3, 3, 7, 500, -1, 42]   # Repeated and invalid iterator values are dropped
+
+    assert np.allclose( wfset.compute_mean_waveform(wf_idcs = wf_idcs).Adcs,
+                        per_waveform_mean(wfset, [3, 7, 42, 150]))
+    assert wfset.MeanAdcsIdcs == (3, 7, 42, 150)
+
+@pytest.mark.parametrize('min_rows_per_kernel', [0, 10000])
+def test_mean_of_the_selected_waveforms(monkeypatch, min_rows_per_kernel):
+
+    monkeypatch.setattr(WaveformSet, '_WaveformSet__min_rows_per_kernel', min_rows_per_kernel)
+
+    wfset = build_wfset()
+    expected_idcs = [i for i, wf in enumerate(wfset.Waveforms) if wf.Channel == 2]
+
+    python_mean = wfset.compute_mean_waveform(2, wf_selector = match_channel)
+    njit_mean = wfset.compute_mean_waveform(2, wf_selector = WaveformSet.match_channel)
+
+    assert np.allclose(python_mean.Adcs, per_waveform_mean(wfset, expected_idcs))
+    assert np.array_equal(njit_mean.Adcs, python_mean.Adcs)
+    assert wfset.MeanAdcsIdcs == tuple(expected_idcs)
+
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+def test_mean_into_the_given_buffer(dtype):
+
+    wfset = build_wfset()
+    out = np.empty((wfset.PointsPerWf,), dtype = dtype)
+
+    mean = wfset.compute_mean_waveform(wf_idcs = list(range(0, 200, 3)), out = out)
+
+    assert mean.Adcs is out
+    assert np.allclose(out, per_waveform_mean(wfset, range(0, 200, 3)), rtol = 1e-5)
+
+def test_mean_reflects_adcs_changed_in_place():
+
+    wfset = build_wfset()
+
+    wfset.compute_mean_waveform()
+    wfset.Waveforms[0].Adcs[:] = 0      # The ADCs are changed in place, behind the back of the WaveformSet
+
+    assert np.allclose( wfset.compute_mean_waveform().Adcs,
+                        per_waveform_mean(wfset, range(len(wfset.Waveforms))))
+
+@pytest.mark.parametrize('kwargs', [
+    dict(wf_idcs = [500, -3]),
+    dict(wf_selector = match_channel, channel = 9),
+    dict(out = np.empty((10,), dtype = np.float64)),
+    dict(out = np.empty((64,), dtype = np.int64))])
+def test_nothing_to_average_or_wrong_buffer_raises(kwargs):
+
+    with pytest.raises(Exception):
+        build_wfset().compute_mean_waveform(**kwargs)
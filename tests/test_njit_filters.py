@@ -0,0 +1,84 @@
+import numba
+import numpy as np
+import pytest
+
+from waffles.Map import Map
+from waffles.Waveform import Waveform
+from waffles.WaveformSet import WaveformSet
+
+
+def build_wfset(n_wfs = 300):
+
+    return WaveformSet(*[Waveform(  i,
+                                    16.,
+                                    np.arange(10, dtype = np.int16),
+                                    i % 3,
+                                    i,
+                                    100 + i % 4,
+                                    i % 7) for i in range(n_wfs)])
+
+def match_endpoint(waveform : Waveform, endpoint : int) -> bool:  # Unregistered counterparts of the default filters
+    return waveform.Endpoint == endpoint
+
+def match_channel(waveform : Waveform, channel : int) -> bool:
+    return waveform.Channel == channel
+
+def match_late_timestamp(waveform : Waveform, timestamp : int) -> bool:
+    return waveform.Timestamp >= timestamp
+
+@numba.njit
+def match_late_timestamp_njit(runs, endpoints, channels, timestamps, timestamp):
+    return timestamps >= timestamp
+
+@pytest.mark.parametrize('max_wfs_per_axes', [None, 3])
+@pytest.mark.parametrize('registered_filter, python_filter, filter_args', [
+    (WaveformSet.match_endpoint, match_endpoint, [[[100], [101]], [[102], [109]]]),
+    (WaveformSet.match_channel, match_channel, [[[0], [1]], [[2], [9]]])])
+def test_registered_filters_match_the_python_ones(  registered_filter,
+                                                    python_filter,
+                                                    filter_args,
+                                                    max_wfs_per_axes):
+    wfset = build_wfset()
+
+    njit_map = wfset.get_map_of_wf_idcs(2,
+                                        2,
+                                        wf_filter = registered_filter,
+                                        filter_args = Map(2, 2, list, data = filter_args),
+                                        max_wfs_per_axes = max_wfs_per_axes)
+    python_map = wfset.get_map_of_wf_idcs(  2,
+                                            2,
+                                            wf_filter = python_filter,
+                                            filter_args = Map(2, 2, list, data = filter_args),
+                                            max_wfs_per_axes = max_wfs_per_axes)
+
+    assert [[list(cell) for cell in row] for row in njit_map.Data] == \
+        [[list(cell) for cell in row] for row in python_map.Data]
+
+def test_custom_njit_filter_matches_the_python_one(monkeypatch):
+
+    monkeypatch.setattr(WaveformSet, '_WaveformSet__njit_filters', dict(WaveformSet._WaveformSet__njit_filters))
+
+    wfset = build_wfset()
+    filter_args = Map(1, 2, list, data = [[[0], [150]]])
+
+    python_map = wfset.get_map_of_wf_idcs(  1,
+                                            2,
+                                            wf_filter = match_late_timestamp,
+                                            filter_args = filter_args,
+                                            max_wfs_per_axes = None)
+
+    WaveformSet.register_njit_filter(match_late_timestamp, match_late_timestamp_njit)
+
+    njit_map = wfset.get_map_of_wf_idcs(1,
+                                        2,
+                                        wf_filter = match_late_timestamp,
+                                        filter_args = filter_args,
+                                        max_wfs_per_axes = None)
+
+    assert [[list(cell) for cell in row] for row in njit_map.Data] == \
+        [[list(cell) for cell in row] for row in python_map.Data]
+
+def test_register_njit_filter_rejects_python_functions():
+
+    with pytest.raises(Exception):
+        WaveformSet.register_njit_filter(match_late_timestamp, match_late_timestamp)